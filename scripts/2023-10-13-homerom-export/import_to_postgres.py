@@ -1,12 +1,22 @@
 import os
+import sys
 
 import pandas as pd
 from sqlalchemy import create_engine
 
-df = pd.read_csv("Artikelnummer - Venture.xlsx - Blad1.csv")
+dir_path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(dir_path, ".."))
 
-print(df)
-print(df.dtypes)
+from lookup.ingest import peek, read_spreadsheet_chunks
+from lookup.pg_loader import copy_into_table
+
+SCHEMA = {"Venture_SKU": "string", "Homeroom_SKU": "string"}
+
+chunks = read_spreadsheet_chunks("Artikelnummer - Venture.xlsx - Blad1.csv", SCHEMA)
+
+first_chunk, chunks = peek(chunks)
+print(first_chunk.head())
+print(first_chunk.dtypes)
 
 conn_string = os.environ.get(
     "DATABASE_URL",
@@ -16,4 +26,4 @@ conn_string = os.environ.get(
 db = create_engine(conn_string)
 conn = db.connect()
 POSTGRES_TABLE_NAME = "temp_vd_homeroom_2023_10_13"
-# df.to_sql(POSTGRES_TABLE_NAME, con=conn, if_exists="fail", index=False, chunksize=1000)
+# copy_into_table(db, chunks, POSTGRES_TABLE_NAME, if_exists="fail")
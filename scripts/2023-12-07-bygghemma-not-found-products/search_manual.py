@@ -1,1029 +1,37 @@
-from dataclasses import dataclass
-import random
+import sys
 import time
-from typing import Optional
-import requests
 import os
 
+dir_path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(dir_path, ".."))
 
-missing_products = [
-    {"mpn": "GR23444"},
-    {"mpn": "GR23541"},
-    {"mpn": "GR23653"},
-    {"mpn": "GR23561"},
-    {"mpn": "GR23609"},
-    {"mpn": "GR23478"},
-    {"mpn": "GR23456"},
-    {"mpn": "GR23676"},
-    {"mpn": "GR23485"},
-    {"mpn": "GR23520"},
-    {"mpn": "GR23854"},
-    {"mpn": "GR23716"},
-    {"mpn": "GR23649"},
-    {"mpn": "GR23488"},
-    {"mpn": "GR23651"},
-    {"mpn": "GR23451"},
-    {"mpn": "GR23450"},
-    {"mpn": "GR23445"},
-    {"mpn": "GR23452"},
-    {"mpn": "GR23544"},
-    {"mpn": "GR23714"},
-    {"mpn": "GR23448"},
-    {"mpn": "GR23438"},
-    {"mpn": "GR23442"},
-    {"mpn": "GR23453"},
-    {"mpn": "GR23457"},
-    {"mpn": "GR23455"},
-    {"mpn": "GR23446"},
-    {"mpn": "GR23443"},
-    {"mpn": "GR23657"},
-    {"mpn": "GR23584"},
-    {"mpn": "GR23449"},
-    {"mpn": "GR23475"},
-    {"mpn": "GR23441"},
-    {"mpn": "GR23482"},
-    {"mpn": "GR23476"},
-    {"mpn": "GR23479"},
-    {"mpn": "GR23647"},
-    {"mpn": "GR23646"},
-    {"mpn": "GR23650"},
-    {"mpn": "GR23654"},
-    {"mpn": "GR23523"},
-    {"mpn": "GR23458"},
-    {"mpn": "GR23439"},
-    {"mpn": "GR23648"},
-    {"mpn": "GR23477"},
-    {"mpn": "GR23949"},
-    {"mpn": "GR23484"},
-    {"mpn": "GR23656"},
-    {"mpn": "GR23454"},
-    {"mpn": "1523-2048"},
-    {"mpn": "GR19267"},
-    {"mpn": "19999-020"},
-    {"mpn": "GR19272"},
-    {"mpn": "GR22529"},
-    {"mpn": "GR23789"},
-    {"mpn": "GR19552"},
-    {"mpn": "19996-015"},
-    {"mpn": "GR19741"},
-    {"mpn": "16027-122"},
-    {"mpn": "GR22456"},
-    {"mpn": "GR23562"},
-    {"mpn": "9291-400"},
-    {"mpn": "GR19436"},
-    {"mpn": "16612-100"},
-    {"mpn": "GR91000-149"},
-    {"mpn": "GR20083"},
-    {"mpn": "GR20568"},
-    {"mpn": "15440-601"},
-    {"mpn": "GR19743"},
-    {"mpn": "GR874"},
-    {"mpn": "GR23710"},
-    {"mpn": "19991-778"},
-    {"mpn": "18064-468"},
-    {"mpn": "GR23493"},
-    {"mpn": "GR19832"},
-    {"mpn": "GR22523"},
-    {"mpn": "GR22964"},
-    {"mpn": "GR23498"},
-    {"mpn": "30039-105"},
-    {"mpn": "GR22190"},
-    {"mpn": "GR23612"},
-    {"mpn": "GR22186"},
-    {"mpn": "GR22074"},
-    {"mpn": "GR23660"},
-    {"mpn": "GR23814"},
-    {"mpn": "GR23806"},
-    {"mpn": "GR23491"},
-    {"mpn": "GR23833"},
-    {"mpn": "GR23797"},
-    {"mpn": "GR23623"},
-    {"mpn": "GR23497"},
-    {"mpn": "GR23865"},
-    {"mpn": "19983-340"},
-    {"mpn": "GR22279"},
-    {"mpn": "GR22277"},
-    {"mpn": "GR173"},
-    {"mpn": "GR22278"},
-    {"mpn": "GR23720"},
-    {"mpn": "GR22067"},
-    {"mpn": "GR23839"},
-    {"mpn": "GR23822"},
-    {"mpn": "GR23494"},
-    {"mpn": "GR23618"},
-    {"mpn": "GR23496"},
-    {"mpn": "19923-300"},
-    {"mpn": "GR23490"},
-    {"mpn": "GR19558"},
-    {"mpn": "GR23913"},
-    {"mpn": "GR22444"},
-    {"mpn": "GR23898"},
-    {"mpn": "GR19387"},
-    {"mpn": "GR730"},
-    {"mpn": "GR734"},
-    {"mpn": "GR731"},
-    {"mpn": "GR23914"},
-    {"mpn": "GR22527"},
-    {"mpn": "GR23795"},
-    {"mpn": "GR22522"},
-    {"mpn": "GR23864"},
-    {"mpn": "GR23621"},
-    {"mpn": "GR22148"},
-    {"mpn": "18000-679"},
-    {"mpn": "GR23535"},
-    {"mpn": "GR23842"},
-    {"mpn": "GR23513"},
-    {"mpn": "GR22079"},
-    {"mpn": "GR23848"},
-    {"mpn": "GR23847"},
-    {"mpn": "GR20677"},
-    {"mpn": "GR23869"},
-    {"mpn": "GR19944"},
-    {"mpn": "GR19768"},
-    {"mpn": "GR22066"},
-    {"mpn": "GR22075"},
-    {"mpn": "GR22065"},
-    {"mpn": "GR19388"},
-    {"mpn": "GR22525"},
-    {"mpn": "GR22071"},
-    {"mpn": "GR19762"},
-    {"mpn": "GR735"},
-    {"mpn": "GR22272"},
-    {"mpn": "GR22273"},
-    {"mpn": "GR22524"},
-    {"mpn": "GR22300"},
-    {"mpn": "GR19230"},
-    {"mpn": "GR23908"},
-    {"mpn": "GR19765"},
-    {"mpn": "GR19772"},
-    {"mpn": "GR19764"},
-    {"mpn": "GR22076"},
-    {"mpn": "GR22307"},
-    {"mpn": "GR22083"},
-    {"mpn": "GR22077"},
-    {"mpn": "GR22313"},
-    {"mpn": "GR22305"},
-    {"mpn": "GR22314"},
-    {"mpn": "GR22298"},
-    {"mpn": "GR22288"},
-    {"mpn": "GR22312"},
-    {"mpn": "GR22304"},
-    {"mpn": "GR22290"},
-    {"mpn": "GR22308"},
-    {"mpn": "GR22310"},
-    {"mpn": "GR22295"},
-    {"mpn": "GR22311"},
-    {"mpn": "GR22293"},
-    {"mpn": "GR22291"},
-    {"mpn": "GR23776"},
-    {"mpn": "GR23779"},
-    {"mpn": "GR23271"},
-    {"mpn": "GR23777"},
-    {"mpn": "GR23916"},
-    {"mpn": "GR23915"},
-    {"mpn": "GR23918"},
-    {"mpn": "GR23917"},
-    {"mpn": "GR23921"},
-    {"mpn": "GR23527"},
-    {"mpn": "GR23920"},
-    {"mpn": "GR23919"},
-    {"mpn": "GR23631"},
-    {"mpn": "GR23632"},
-    {"mpn": "GR23630"},
-    {"mpn": "GR23622"},
-    {"mpn": "GR23619"},
-    {"mpn": "GR23628"},
-    {"mpn": "GR23627"},
-    {"mpn": "GR23629"},
-    {"mpn": "GR23625"},
-    {"mpn": "GR23607"},
-    {"mpn": "GR23857"},
-    {"mpn": "GR23844"},
-    {"mpn": "GR23614"},
-    {"mpn": "GR23661"},
-    {"mpn": "GR23845"},
-    {"mpn": "GR23620"},
-    {"mpn": "GR23624"},
-    {"mpn": "GR23866"},
-    {"mpn": "GR23849"},
-    {"mpn": "GR23615"},
-    {"mpn": "GR23856"},
-    {"mpn": "GR23846"},
-    {"mpn": "GR23616"},
-    {"mpn": "GR23838"},
-    {"mpn": "GR23617"},
-    {"mpn": "GR23770"},
-    {"mpn": "GR19722"},
-    {"mpn": "GR23880"},
-    {"mpn": "GR19124"},
-    {"mpn": "GR20086"},
-    {"mpn": "GR873"},
-    {"mpn": "15643-337"},
-    {"mpn": "40000-013"},
-    {"mpn": "GR22350"},
-    {"mpn": "GR23952"},
-    {"mpn": "GR22834"},
-    {"mpn": "GR989"},
-    {"mpn": "GR22352"},
-    {"mpn": "27702-998"},
-    {"mpn": "30164-107"},
-    {"mpn": "19981-101"},
-    {"mpn": "19933-588"},
-    {"mpn": "65-302"},
-    {"mpn": "GR19884"},
-    {"mpn": "20077-107"},
-    {"mpn": "60069-102"},
-    {"mpn": "29995-468"},
-    {"mpn": "GR19564"},
-    {"mpn": "6945-100"},
-    {"mpn": "GR14071"},
-    {"mpn": "9351-079"},
-    {"mpn": "GR23474"},
-    {"mpn": "15713-530"},
-    {"mpn": "29888-468"},
-    {"mpn": "20002-120"},
-    {"mpn": "GR23483"},
-    {"mpn": "GR23755"},
-    {"mpn": "GR23608"},
-    {"mpn": "GR14096"},
-    {"mpn": "16026-122"},
-    {"mpn": "29997-685"},
-    {"mpn": "29888-120"},
-    {"mpn": "16026-100"},
-    {"mpn": "GR22831"},
-    {"mpn": "8091-751"},
-    {"mpn": "30084-102"},
-    {"mpn": "30161-107"},
-    {"mpn": "16013-109"},
-    {"mpn": "19971-100"},
-    {"mpn": "GR14078"},
-    {"mpn": "16025-100"},
-    {"mpn": "27704-440"},
-    {"mpn": "GR20626"},
-    {"mpn": "20081-107"},
-    {"mpn": "GR20660"},
-    {"mpn": "GR20676"},
-    {"mpn": "29934-798"},
-    {"mpn": "18076-250"},
-    {"mpn": "GR22421"},
-    {"mpn": "GR20222"},
-    {"mpn": "GR14053"},
-    {"mpn": "GR19669"},
-    {"mpn": "GR22420"},
-    {"mpn": "20076-121"},
-    {"mpn": "GR20625"},
-    {"mpn": "16025-122"},
-    {"mpn": "44000-170"},
-    {"mpn": "8189-751"},
-    {"mpn": "GR990"},
-    {"mpn": "27702-990"},
-    {"mpn": "29991-660"},
-    {"mpn": "29995-120"},
-    {"mpn": "29923-488"},
-    {"mpn": "GR20675"},
-    {"mpn": "GR22886"},
-    {"mpn": "27700-440"},
-    {"mpn": "27701-890"},
-    {"mpn": "29934-788"},
-    {"mpn": "GR23487"},
-    {"mpn": "20008-123"},
-    {"mpn": "19998-120"},
-    {"mpn": "GR434"},
-    {"mpn": "GR23481"},
-    {"mpn": "GR23480"},
-    {"mpn": "29923-300"},
-    {"mpn": "9351-006"},
-    {"mpn": "1103-121"},
-    {"mpn": "27700-447"},
-    {"mpn": "8191-089"},
-    {"mpn": "GR551"},
-    {"mpn": "GR19670"},
-    {"mpn": "GR13800-000"},
-    {"mpn": "GR22422"},
-    {"mpn": "2033-444"},
-    {"mpn": "9277-408"},
-    {"mpn": "8289-089"},
-    {"mpn": "29919-660"},
-    {"mpn": "29902-990"},
-    {"mpn": "GR23066"},
-    {"mpn": "GR23954"},
-    {"mpn": "GR19987"},
-    {"mpn": "GR22849"},
-    {"mpn": "GR20636"},
-    {"mpn": "29880-120"},
-    {"mpn": "GR20007"},
-    {"mpn": "27700-446"},
-    {"mpn": "27700-444"},
-    {"mpn": "GR19908"},
-    {"mpn": "1004-444"},
-    {"mpn": "GR22427"},
-    {"mpn": "19972-100"},
-    {"mpn": "GR23472"},
-    {"mpn": "19970-100"},
-    {"mpn": "9141-010"},
-    {"mpn": "GR988"},
-    {"mpn": "54000-088"},
-    {"mpn": "GR14084"},
-    {"mpn": "20028-103"},
-    {"mpn": "GR435"},
-    {"mpn": "GR91000-156"},
-    {"mpn": "GR20635"},
-    {"mpn": "20005-112"},
-    {"mpn": "27701-450"},
-    {"mpn": "19953-434"},
-    {"mpn": "20025-125"},
-    {"mpn": "GR91000-138"},
-    {"mpn": "1521-102"},
-    {"mpn": "139901.AA"},
-    {"mpn": "80584000"},
-    {"mpn": "765130000"},
-    {"mpn": "310145"},
-    {"mpn": "S600114.22"},
-    {"mpn": "632436"},
-    {"mpn": "18500055"},
-    {"mpn": "632314"},
-    {"mpn": "130427.AE"},
-    {"mpn": "744755500"},
-    {"mpn": "630201.75"},
-    {"mpn": "242480"},
-    {"mpn": "83110010"},
-    {"mpn": "34881500"},
-    {"mpn": "130016"},
-    {"mpn": "83841500"},
-    {"mpn": "58920100"},
-    {"mpn": "733000.CL"},
-    {"mpn": "733005.TT"},
-    {"mpn": "953202"},
-    {"mpn": "18512069"},
-    {"mpn": "720080.16"},
-    {"mpn": "80635010"},
-    {"mpn": "270100.62"},
-    {"mpn": "409713.60AE"},
-    {"mpn": "80604600"},
-    {"mpn": "34450140"},
-    {"mpn": "733005"},
-    {"mpn": "263006.CA"},
-    {"mpn": "131037.AE"},
-    {"mpn": "58902000"},
-    {"mpn": "951001"},
-    {"mpn": "630387.AE"},
-    {"mpn": "630401.AE"},
-    {"mpn": "703062"},
-    {"mpn": "702665"},
-    {"mpn": "80607000"},
-    {"mpn": "34093000"},
-    {"mpn": "951110"},
-    {"mpn": "84908000"},
-    {"mpn": "650280.44"},
-    {"mpn": "28235000"},
-    {"mpn": "95076000"},
-    {"mpn": "29882270"},
-    {"mpn": "80200010"},
-    {"mpn": "951106"},
-    {"mpn": "42940600"},
-    {"mpn": "705600.80"},
-    {"mpn": "130340"},
-    {"mpn": "271500.44"},
-    {"mpn": "732156"},
-    {"mpn": "241230"},
-    {"mpn": "84018710"},
-    {"mpn": "741588700"},
-    {"mpn": "702366"},
-    {"mpn": "632440"},
-    {"mpn": "39753000"},
-    {"mpn": "83100010"},
-    {"mpn": "30050600"},
-    {"mpn": "S600034"},
-    {"mpn": "521055.62"},
-    {"mpn": "147270000"},
-    {"mpn": "170000000"},
-    {"mpn": "242100"},
-    {"mpn": "83901500"},
-    {"mpn": "765540000"},
-    {"mpn": "707155.0065"},
-    {"mpn": "18512041"},
-    {"mpn": "630821.AE"},
-    {"mpn": "22801511"},
-    {"mpn": "18501439"},
-    {"mpn": "409713.22AE"},
-    {"mpn": "272151.62CA"},
-    {"mpn": "740207900"},
-    {"mpn": "94782000"},
-    {"mpn": "571617700"},
-    {"mpn": "17152609"},
-    {"mpn": "379307700"},
-    {"mpn": "953108"},
-    {"mpn": "630280.25"},
-    {"mpn": "17191550"},
-    {"mpn": "22811501"},
-    {"mpn": "744752100"},
-    {"mpn": "80010010"},
-    {"mpn": "33853602"},
-    {"mpn": "242353"},
-    {"mpn": "700665.0065"},
-    {"mpn": "273013.CA"},
-    {"mpn": "630216.AE"},
-    {"mpn": "766884600"},
-    {"mpn": "732152"},
-    {"mpn": "733011.CA"},
-    {"mpn": "58011000"},
-    {"mpn": "80654010"},
-    {"mpn": "732000"},
-    {"mpn": "707105.11"},
-    {"mpn": "707120"},
-    {"mpn": "16406000"},
-    {"mpn": "953115"},
-    {"mpn": "632333"},
-    {"mpn": "22961001"},
-    {"mpn": "18161709"},
-    {"mpn": "707000.0011"},
-    {"mpn": "32651519"},
-    {"mpn": "262091.0011"},
-    {"mpn": "130315"},
-    {"mpn": "31983600"},
-    {"mpn": "S600142.60"},
-    {"mpn": "732118"},
-    {"mpn": "705100.25"},
-    {"mpn": "707060.0011"},
-    {"mpn": "95000702"},
-    {"mpn": "702365"},
-    {"mpn": "253003"},
-    {"mpn": "17951200"},
-    {"mpn": "753001"},
-    {"mpn": "262081.0015"},
-    {"mpn": "707151"},
-    {"mpn": "271900.60"},
-    {"mpn": "630211"},
-    {"mpn": "632435"},
-    {"mpn": "34811759"},
-    {"mpn": "250000"},
-    {"mpn": "82181000"},
-    {"mpn": "733001"},
-    {"mpn": "17152601"},
-    {"mpn": "33855502"},
-    {"mpn": "18201545"},
-    {"mpn": "744750000"},
-    {"mpn": "705500.25"},
-    {"mpn": "95000102"},
-    {"mpn": "94753900"},
-    {"mpn": "58010900"},
-    {"mpn": "400050"},
-    {"mpn": "84828000"},
-    {"mpn": "16161000"},
-    {"mpn": "370698000"},
-    {"mpn": "109015.AE"},
-    {"mpn": "744007700"},
-    {"mpn": "28280001"},
-    {"mpn": "93780000"},
-    {"mpn": "91000000"},
-    {"mpn": "579597700"},
-    {"mpn": "731050"},
-    {"mpn": "146255500"},
-    {"mpn": "S600029.44"},
-    {"mpn": "273021.12CA"},
-    {"mpn": "702376.SA"},
-    {"mpn": "39710000"},
-    {"mpn": "20031500"},
-    {"mpn": "749308700"},
-    {"mpn": "93450000"},
-    {"mpn": "575040000"},
-    {"mpn": "310014"},
-    {"mpn": "243097"},
-    {"mpn": "130320"},
-    {"mpn": "271600.44"},
-    {"mpn": "707150"},
-    {"mpn": "707100.11"},
-    {"mpn": "766754300"},
-    {"mpn": "702607"},
-    {"mpn": "209575.60"},
-    {"mpn": "17951000"},
-    {"mpn": "82101004"},
-    {"mpn": "93441000"},
-    {"mpn": "58930959"},
-    {"mpn": "33471550"},
-    {"mpn": "83710000"},
-    {"mpn": "19452150"},
-    {"mpn": "730102"},
-    {"mpn": "83013000"},
-    {"mpn": "209547"},
-    {"mpn": "S600040"},
-    {"mpn": "27352500"},
-    {"mpn": "732101.TT"},
-    {"mpn": "707161.11"},
-    {"mpn": "16802500"},
-    {"mpn": "19701649"},
-    {"mpn": "28441500"},
-    {"mpn": "18512071"},
-    {"mpn": "242311"},
-    {"mpn": "753070"},
-    {"mpn": "575610000"},
-    {"mpn": "S600043"},
-    {"mpn": "245030"},
-    {"mpn": "39730000"},
-    {"mpn": "273001.62CA"},
-    {"mpn": "81904500"},
-    {"mpn": "765200000"},
-    {"mpn": "130277.0065"},
-    {"mpn": "951003.2000"},
-    {"mpn": "520160"},
-    {"mpn": "740134600"},
-    {"mpn": "34201800"},
-    {"mpn": "27923500"},
-    {"mpn": "740816100"},
-    {"mpn": "130316"},
-    {"mpn": "702800.25"},
-    {"mpn": "951111.C"},
-    {"mpn": "30300610"},
-    {"mpn": "766650000"},
-    {"mpn": "730100.DB"},
-    {"mpn": "574910000"},
-    {"mpn": "371610000"},
-    {"mpn": "91100000"},
-    {"mpn": "130737"},
-    {"mpn": "574510000"},
-    {"mpn": "S600030.44"},
-    {"mpn": "130357.AA"},
-    {"mpn": "81301500"},
-    {"mpn": "953103.12"},
-    {"mpn": "S600052"},
-    {"mpn": "92052040"},
-    {"mpn": "731100.SA"},
-    {"mpn": "S600013.44"},
-    {"mpn": "372210000"},
-    {"mpn": "S600142.14"},
-    {"mpn": "34181500"},
-    {"mpn": "630283"},
-    {"mpn": "753050"},
-    {"mpn": "730202"},
-    {"mpn": "574100000"},
-    {"mpn": "18181001"},
-    {"mpn": "701102.AE"},
-    {"mpn": "701033"},
-    {"mpn": "600130000"},
-    {"mpn": "82041000"},
-    {"mpn": "746257700"},
-    {"mpn": "14200120"},
-    {"mpn": "630142.AE"},
-    {"mpn": "34204120"},
-    {"mpn": "707151.0011"},
-    {"mpn": "29661511"},
-    {"mpn": "952005"},
-    {"mpn": "707150.11"},
-    {"mpn": "521054.12"},
-    {"mpn": "749210000"},
-    {"mpn": "746254600"},
-    {"mpn": "766657400"},
-    {"mpn": "579700000"},
-    {"mpn": "740862100"},
-    {"mpn": "370690000"},
-    {"mpn": "16416130"},
-    {"mpn": "34881620"},
-    {"mpn": "29540000"},
-    {"mpn": "701032"},
-    {"mpn": "243001.CA"},
-    {"mpn": "262051"},
-    {"mpn": "18150315"},
-    {"mpn": "632409"},
-    {"mpn": "630284"},
-    {"mpn": "S600029.12"},
-    {"mpn": "81904000"},
-    {"mpn": "19550150"},
-    {"mpn": "31851519"},
-    {"mpn": "271500.12"},
-    {"mpn": "28320000"},
-    {"mpn": "95020100"},
-    {"mpn": "700958"},
-    {"mpn": "733070.CA"},
-    {"mpn": "S600032"},
-    {"mpn": "82131600"},
-    {"mpn": "278020000"},
-    {"mpn": "951102"},
-    {"mpn": "632401.AE"},
-    {"mpn": "250100"},
-    {"mpn": "272101.62CA"},
-    {"mpn": "449045.AE"},
-    {"mpn": "94703000"},
-    {"mpn": "732161"},
-    {"mpn": "262091"},
-    {"mpn": "S600012"},
-    {"mpn": "S600042"},
-    {"mpn": "700866"},
-    {"mpn": "16414000"},
-    {"mpn": "58970109"},
-    {"mpn": "14202120"},
-    {"mpn": "740200000"},
-    {"mpn": "574710000"},
-    {"mpn": "373137700"},
-    {"mpn": "18503745"},
-    {"mpn": "103500000"},
-    {"mpn": "32500110"},
-    {"mpn": "740227900"},
-    {"mpn": "430101"},
-    {"mpn": "253001"},
-    {"mpn": "409712.76AE"},
-    {"mpn": "740205500"},
-    {"mpn": "630282.66"},
-    {"mpn": "702346.SA"},
-    {"mpn": "409402"},
-    {"mpn": "S600046"},
-    {"mpn": "131047.AE"},
-    {"mpn": "S600037"},
-    {"mpn": "731100"},
-    {"mpn": "630350.AE"},
-    {"mpn": "650281.12"},
-    {"mpn": "S600142.12"},
-    {"mpn": "170210000"},
-    {"mpn": "130640.AE"},
-    {"mpn": "574037400"},
-    {"mpn": "18581011"},
-    {"mpn": "16501000"},
-    {"mpn": "209575"},
-    {"mpn": "34000600"},
-    {"mpn": "273023.12CA"},
-    {"mpn": "253150"},
-    {"mpn": "271900.62"},
-    {"mpn": "748210000"},
-    {"mpn": "22261210"},
-    {"mpn": "256060"},
-    {"mpn": "181210000"},
-    {"mpn": "766730000"},
-    {"mpn": "S600014.62"},
-    {"mpn": "28234000"},
-    {"mpn": "29830529"},
-    {"mpn": "272101.CA"},
-    {"mpn": "29921530"},
-    {"mpn": "35007000"},
-    {"mpn": "22851511"},
-    {"mpn": "130348"},
-    {"mpn": "274500000"},
-    {"mpn": "740815535"},
-    {"mpn": "91012010"},
-    {"mpn": "745002100"},
-    {"mpn": "16406100"},
-    {"mpn": "24321532"},
-    {"mpn": "85820000"},
-    {"mpn": "261600"},
-    {"mpn": "27250009"},
-    {"mpn": "574000000"},
-    {"mpn": "732150"},
-    {"mpn": "740225500"},
-    {"mpn": "632305"},
-    {"mpn": "953110"},
-    {"mpn": "702610"},
-    {"mpn": "34323000"},
-    {"mpn": "373070000"},
-    {"mpn": "S600053"},
-    {"mpn": "732050.TT"},
-    {"mpn": "409712.12AE"},
-    {"mpn": "705500.66"},
-    {"mpn": "83210000"},
-    {"mpn": "100700000"},
-    {"mpn": "461760"},
-    {"mpn": "370160000"},
-    {"mpn": "750000"},
-    {"mpn": "521053.22"},
-    {"mpn": "256010"},
-    {"mpn": "632439"},
-    {"mpn": "131170.AE"},
-    {"mpn": "29882200"},
-    {"mpn": "630330"},
-    {"mpn": "733006.CA"},
-    {"mpn": "701030"},
-    {"mpn": "766620000"},
-    {"mpn": "740206100"},
-    {"mpn": "732166"},
-    {"mpn": "18622501"},
-    {"mpn": "80000000"},
-    {"mpn": "741587900"},
-    {"mpn": "630236"},
-    {"mpn": "639260.AE"},
-    {"mpn": "571616100"},
-    {"mpn": "521050.62"},
-    {"mpn": "746200000"},
-    {"mpn": "750050"},
-    {"mpn": "83840000"},
-    {"mpn": "14051560"},
-    {"mpn": "81321500"},
-    {"mpn": "579570000"},
-    {"mpn": "241210"},
-    {"mpn": "16602500"},
-    {"mpn": "S600013.12"},
-    {"mpn": "95000740"},
-    {"mpn": "375630000"},
-    {"mpn": "209566"},
-    {"mpn": "94760900"},
-    {"mpn": "733092"},
-    {"mpn": "731150.0011"},
-    {"mpn": "49703900"},
-    {"mpn": "S600066.62"},
-    {"mpn": "28620000"},
-    {"mpn": "701028"},
-    {"mpn": "574800000"},
-    {"mpn": "951108.22"},
-    {"mpn": "740867900"},
-    {"mpn": "14081550"},
-    {"mpn": "81910000"},
-    {"mpn": "131048.AE"},
-    {"mpn": "521055.22"},
-    {"mpn": "740222100"},
-    {"mpn": "766647700"},
-    {"mpn": "953104"},
-    {"mpn": "83580000"},
-    {"mpn": "370348000"},
-    {"mpn": "243006.CA"},
-    {"mpn": "91260000"},
-    {"mpn": "749302100"},
-    {"mpn": "400006"},
-    {"mpn": "83801500"},
-    {"mpn": "81800000"},
-    {"mpn": "732101"},
-    {"mpn": "31530000"},
-    {"mpn": "575570000"},
-    {"mpn": "370780000"},
-    {"mpn": "S600029.22"},
-    {"mpn": "29564200"},
-    {"mpn": "139835.20AE"},
-    {"mpn": "720082"},
-    {"mpn": "S600142.62"},
-    {"mpn": "18531509"},
-    {"mpn": "27751500"},
-    {"mpn": "S600029"},
-    {"mpn": "744757700"},
-    {"mpn": "766647900"},
-    {"mpn": "83507010"},
-    {"mpn": "17902000"},
-    {"mpn": "S600028.12"},
-    {"mpn": "521052.60"},
-    {"mpn": "370290000"},
-    {"mpn": "707100.0011"},
-    {"mpn": "951105"},
-    {"mpn": "701010.AE"},
-    {"mpn": "732100.CA"},
-    {"mpn": "22952001"},
-    {"mpn": "95016100"},
-    {"mpn": "94661000"},
-    {"mpn": "S600142.66"},
-    {"mpn": "571617900"},
-    {"mpn": "766864600"},
-    {"mpn": "766644600"},
-    {"mpn": "28441509"},
-    {"mpn": "243070.CA"},
-    {"mpn": "209600.AE"},
-    {"mpn": "609120000"},
-    {"mpn": "91034100"},
-    {"mpn": "95000162"},
-    {"mpn": "27990000"},
-    {"mpn": "34211120"},
-    {"mpn": "80670010"},
-    {"mpn": "579180000"},
-    {"mpn": "270100.60"},
-    {"mpn": "14200160"},
-    {"mpn": "707010.0011"},
-    {"mpn": "18500559"},
-    {"mpn": "29991000"},
-    {"mpn": "42931000"},
-    {"mpn": "33857002"},
-    {"mpn": "740864600"},
-    {"mpn": "131103.AE"},
-    {"mpn": "83016000"},
-    {"mpn": "370200000"},
-    {"mpn": "42940400"},
-    {"mpn": "670710000"},
-    {"mpn": "60850000"},
-    {"mpn": "741585500"},
-    {"mpn": "750150"},
-    {"mpn": "374030000"},
-    {"mpn": "261500"},
-    {"mpn": "19552150"},
-    {"mpn": "83930000"},
-    {"mpn": "241200"},
-    {"mpn": "130424.AE"},
-    {"mpn": "59942000"},
-    {"mpn": "310009"},
-    {"mpn": "574570000"},
-    {"mpn": "16160000"},
-    {"mpn": "400001"},
-    {"mpn": "650281"},
-    {"mpn": "29701500"},
-    {"mpn": "242200"},
-    {"mpn": "S600047"},
-    {"mpn": "272091.62CA"},
-    {"mpn": "749307900"},
-    {"mpn": "630210"},
-    {"mpn": "632433"},
-    {"mpn": "263001.CA"},
-    {"mpn": "650281.44"},
-    {"mpn": "890420"},
-    {"mpn": "271800"},
-    {"mpn": "276500000"},
-    {"mpn": "S600012.44"},
-    {"mpn": "370718000"},
-    {"mpn": "400022"},
-    {"mpn": "260000"},
-    {"mpn": "81900000"},
-    {"mpn": "85900000"},
-    {"mpn": "80650000"},
-    {"mpn": "766884300"},
-    {"mpn": "370140000"},
-    {"mpn": "18161101"},
-    {"mpn": "29921500"},
-    {"mpn": "271800.12"},
-    {"mpn": "951002.2000"},
-    {"mpn": "766637700"},
-    {"mpn": "370100000"},
-    {"mpn": "409712.62AE"},
-    {"mpn": "S600030.60"},
-    {"mpn": "139898.AE"},
-    {"mpn": "176300000"},
-    {"mpn": "766667400"},
-    {"mpn": "270100.22"},
-    {"mpn": "261600.DB"},
-    {"mpn": "632318"},
-    {"mpn": "702670"},
-    {"mpn": "80206000"},
-    {"mpn": "59240000"},
-    {"mpn": "241220"},
-    {"mpn": "729482"},
-    {"mpn": "520200"},
-    {"mpn": "740627900"},
-    {"mpn": "81400000"},
-    {"mpn": "740138700"},
-    {"mpn": "733000"},
-    {"mpn": "702840"},
-    {"mpn": "33432850"},
-    {"mpn": "952001"},
-    {"mpn": "83910000"},
-    {"mpn": "25561501"},
-    {"mpn": "400003"},
-    {"mpn": "91270000"},
-    {"mpn": "952005.C"},
-    {"mpn": "740215535"},
-    {"mpn": "733090"},
-    {"mpn": "278070700"},
-    {"mpn": "95160000"},
-    {"mpn": "732200"},
-    {"mpn": "272151.CA"},
-    {"mpn": "747300000"},
-    {"mpn": "19450150"},
-    {"mpn": "273011.44CA"},
-    {"mpn": "409623.AE"},
-    {"mpn": "630359.AE"},
-    {"mpn": "740620000"},
-    {"mpn": "29882225"},
-    {"mpn": "700742"},
-    {"mpn": "172000000"},
-    {"mpn": "18512059"},
-    {"mpn": "263081.CA"},
-    {"mpn": "575670000"},
-    {"mpn": "90670000"},
-    {"mpn": "579548700"},
-    {"mpn": "702605"},
-    {"mpn": "91200000"},
-    {"mpn": "22261200"},
-    {"mpn": "409590.25AE"},
-    {"mpn": "579590000"},
-    {"mpn": "731002"},
-    {"mpn": "39680000"},
-    {"mpn": "705100"},
-    {"mpn": "S600114"},
-    {"mpn": "241920"},
-    {"mpn": "766654600"},
-    {"mpn": "84528510"},
-    {"mpn": "83931500"},
-    {"mpn": "29921509"},
-    {"mpn": "953005"},
-    {"mpn": "579120000"},
-    {"mpn": "241905"},
-    {"mpn": "S600142.16"},
-    {"mpn": "S600033"},
-    {"mpn": "733000.LD"},
-    {"mpn": "60860000"},
-    {"mpn": "243020.CA"},
-    {"mpn": "24311530"},
-    {"mpn": "740226100"},
-    {"mpn": "139910.AE"},
-    {"mpn": "740865500"},
-    {"mpn": "733051"},
-    {"mpn": "400537"},
-    {"mpn": "S600013.60"},
-    {"mpn": "765690000"},
-    {"mpn": "729490"},
-    {"mpn": "241000"},
-    {"mpn": "130354"},
-    {"mpn": "242150"},
-    {"mpn": "18621501"},
-    {"mpn": "209575.62"},
-    {"mpn": "32500010"},
-    {"mpn": "82106500"},
-    {"mpn": "130127"},
-    {"mpn": "272071.22CA"},
-    {"mpn": "92050050"},
-    {"mpn": "520240"},
-    {"mpn": "81320000"},
-    {"mpn": "630283.66"},
-    {"mpn": "83500010"},
-    {"mpn": "S600054"},
-    {"mpn": "574227400"},
-    {"mpn": "749306100"},
-    {"mpn": "270100.44"},
-    {"mpn": "18581511"},
-    {"mpn": "83520010"},
-    {"mpn": "130363.AE"},
-    {"mpn": "273001.12CA"},
-    {"mpn": "83130010"},
-    {"mpn": "42820050"},
-    {"mpn": "18011559"},
-    {"mpn": "S600142.22"},
-    {"mpn": "130122.AE"},
-    {"mpn": "630202"},
-    {"mpn": "245000"},
-    {"mpn": "139945"},
-    {"mpn": "309600"},
-    {"mpn": "85500010"},
-    {"mpn": "130313"},
-    {"mpn": "18502549"},
-    {"mpn": "571610000"},
-    {"mpn": "745007900"},
-    {"mpn": "S600163.60"},
-    {"mpn": "83535010"},
-    {"mpn": "521054.60"},
-    {"mpn": "850725.AE"},
-    {"mpn": "130325"},
-    {"mpn": "521055"},
-    {"mpn": "273001.60CA"},
-    {"mpn": "732111"},
-    {"mpn": "94712000"},
-    {"mpn": "372200000"},
-    {"mpn": "766646100"},
-    {"mpn": "130348.12"},
-    {"mpn": "94640000"},
-    {"mpn": "271600.22"},
-    {"mpn": "766686100"},
-    {"mpn": "30550610"},
-    {"mpn": "579287400"},
-    {"mpn": "29430000"},
-    {"mpn": "241805"},
-    {"mpn": "630235"},
-    {"mpn": "273013.62CA"},
-    {"mpn": "16410000"},
-    {"mpn": "S600067"},
-    {"mpn": "93440000"},
-    {"mpn": "574770000"},
-    {"mpn": "80666000"},
-    {"mpn": "81331250"},
-    {"mpn": "29651501"},
-    {"mpn": "766638700"},
-    {"mpn": "749305500"},
-    {"mpn": "130008"},
-    {"mpn": "521055.60"},
-    {"mpn": "95000000"},
-    {"mpn": "261100.DB"},
-    {"mpn": "160000000"},
-    {"mpn": "579597900"},
-    {"mpn": "733023.CA"},
-    {"mpn": "34201120"},
-    {"mpn": "80110010"},
-    {"mpn": "409713.AE"},
-    {"mpn": "92060150"},
-    {"mpn": "409562.AE"},
-    {"mpn": "271500.60"},
-    {"mpn": "245001"},
-    {"mpn": "271900.22"},
-    {"mpn": "S600114.60"},
-    {"mpn": "702604"},
-    {"mpn": "273021.44CA"},
-    {"mpn": "731202"},
-    {"mpn": "29440009"},
-    {"mpn": "747305500"},
-    {"mpn": "700756"},
-    {"mpn": "740217900"},
-    {"mpn": "731102"},
-    {"mpn": "740812100"},
-    {"mpn": "409399.AE"},
-    {"mpn": "27250000"},
-    {"mpn": "702845"},
-    {"mpn": "22821511"},
-    {"mpn": "953003"},
-    {"mpn": "631081.AE"},
-    {"mpn": "766862100"},
-    {"mpn": "S600027.62"},
-]
+from lookup import retailers
+from lookup.inputs import read_identifiers, sample
+from lookup.review import review, write_report
 
+# PUT PRODUCTS TO SEARCH FOR HERE, under the "mpn" header
+MISSING_PRODUCTS_FILE = os.path.join(dir_path, "missing_products.csv")
 
-def venture_design_search_url(query: str) -> str:
-    return f"https://www.venturedesign.se/search/{query}"
+BYGGHEMMA = retailers.get("bygghemma")
 
-
-def bygghemma_search_url(query):
-    return f"https://www.bygghemma.se/sok/?phrase={query}"
+# How many random products to review in one report
+SAMPLE_SIZE = int(os.getenv("SAMPLE_SIZE", "200"))
+REPORT_PATH = os.getenv("REVIEW_REPORT", "search_review.html")
 
 
 def test_search(retailer_queries: list[str]):
     for i in range(len(retailer_queries)):
-        os.system(f"open {bygghemma_search_url(retailer_queries[i])}")
+        os.system(f"open {BYGGHEMMA.search_url(retailer_queries[i])}")
         time.sleep(1)
 
 
+def review_search(retailer_queries: list[str]):
+    """Fetch every search page at once and write their top hits to one HTML report"""
+    rows = review(BYGGHEMMA, retailer_queries)
+    write_report(REPORT_PATH, rows, f"Bygghemma search review ({len(rows)} queries)")
+    os.system(f"open {REPORT_PATH}")
+
+
 # test_search([p["EAN Code"] or p["SKU"] for p in products], [p["SKU"] for p in products])
 # test_search([p["SKU"] for p in products], [p["SKU"] for p in products])
 # test_search([p["SKU WF"] for p in products], [p["SKU"] for p in products])
@@ -1032,4 +40,7 @@ def test_search(retailer_queries: list[str]):
 #     [p["sku"] for p in products_from_wayfair_export],
 #     [p["mpn"] for p in products_from_wayfair_export],
 # )
-test_search([p["mpn"] for p in random.sample(missing_products, 20)])
+# test_search(sample(read_identifiers(MISSING_PRODUCTS_FILE, column="mpn"), 20))
+review_search(
+    sample(read_identifiers(MISSING_PRODUCTS_FILE, column="mpn"), SAMPLE_SIZE)
+)
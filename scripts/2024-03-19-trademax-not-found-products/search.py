@@ -1,13 +1,18 @@
 from dataclasses import dataclass
 import json
 import re
+import sys
 import time
 from typing import Optional
-import requests
 import os
 
 import structlog
 
+dir_path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(dir_path, ".."))
+
+from lookup import client, retailers
+
 # import pytest
 
 
@@ -26,47 +31,7 @@ missing_skus = [
 
 logger = structlog.get_logger()
 
-DEFAULT_REQUEST_HEADER = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36"
-}
-
-
-def venture_design_search_url(query: str) -> str:
-    return f"https://www.venturedesign.se/search/{query}"
-
-
-def trademax_search_url(query: str) -> str:
-    return f"https://www.trademax.se/search?q={query}"
-
-
-def trademax_search_by_sku(sku: str) -> Optional[str]:
-    """Find the product on Trademax and return the product url"""
-    url = trademax_search_url(sku)
-    response = requests.get(url, headers=DEFAULT_REQUEST_HEADER)
-
-    if response.status_code >= 300:
-        raise Exception(f"Request error, status_code: {response.status_code}")
-
-    html = response.text
-    # with open("./tmp.html", "w") as f:
-    #     f.write(html)
-
-    # Check to see if we got redirected to a product page:
-    if re.search(r"-p\d+", response.url):
-        return response.url
-
-    # Check to see if there are any search result:
-    if html.find(f'sku_id":"{sku}') == -1:
-        return None
-
-    # Find the 1st url as the result:
-    pattern = r'"uri":"(\\\/[^"]+)"'
-    match = re.search(pattern, html)
-    if match:
-        uri = match.group(1)
-        return "https://www.trademax.se" + uri.replace("\\/", "/")
-
-    return None
+TRADEMAX = retailers.get("trademax")
 
 
 # @pytest.mark.skip
@@ -92,23 +57,21 @@ def main():
     product_found = {}
 
     for sku in missing_skus:
-        product_url = trademax_search_by_sku(sku)
+        product_url = TRADEMAX.search_by_sku(sku)
         if product_url is not None:
             logger.info(
                 "Product found",
                 sku=sku,
-                search_url=trademax_search_url(sku),
+                search_url=TRADEMAX.search_url(sku),
                 url=product_url,
             )
             product_found[sku] = product_url
         else:
             logger.warning(
-                "Not found", sku=sku, search_url=trademax_search_url(sku), url=None
+                "Not found", sku=sku, search_url=TRADEMAX.search_url(sku), url=None
             )
 
-        # Do not scrape too fast
-        # time.sleep(0.5)
-
+    logger.info("Response cache", **client.cache_stats())
     print("\nTotal products found:", len(product_found), "out of", len(missing_skus))
 
     with open("products_found.csv", "w") as f:
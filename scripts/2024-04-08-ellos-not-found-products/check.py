@@ -1,19 +1,18 @@
-from dataclasses import dataclass
-import json
-import re
-import time
+import sys
 from typing import Optional
-import requests
 import os
 
 import structlog
 
+dir_path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(dir_path, ".."))
+
+from lookup import client, retailers
+from lookup.existence import ExistenceCheck, Liveness
 
 logger = structlog.get_logger()
 
-DEFAULT_REQUEST_HEADER = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36"
-}
+ELLOS = retailers.get("ellos")
 
 
 urls = [
@@ -115,31 +114,32 @@ urls = [
 ]
 
 
-def ellos_check_product_exist(url: str) -> Optional[str]:
-    response = requests.get(url, headers=DEFAULT_REQUEST_HEADER)
-    if response.status_code == 404:
+def ellos_found_url(check: ExistenceCheck) -> Optional[str]:
+    if check.liveness == Liveness.NOT_FOUND:
         return None
-    if response.status_code >= 200 and response.status_code <= 299:
-        return response.url
+    if check.status_code >= 200 and check.status_code <= 299:
+        return check.final_url
 
-    logger.info("New status code", status_code=response.status_code)
-    return response.url
+    logger.info(
+        "New status code", status_code=check.status_code, liveness=check.liveness
+    )
+    return check.final_url
 
 
 def main():
     OUTPUT_FILEPATH = "products_not_found.csv"
     product_found = {}
+    # One request per url: checking ellos variants through their parent
+    # article is not verified yet, see variants.check_group
     for product_url in urls:
-        found_url = ellos_check_product_exist(product_url)
+        found_url = ellos_found_url(ELLOS.check_product(product_url))
         if found_url:
             logger.info("Product found", url=product_url)
             product_found[product_url] = found_url
         else:
             logger.warning("Not found", url=product_url)
 
-        # Do not scrape too fast
-        time.sleep(0.5)
-
+    logger.info("Response cache", **client.cache_stats())
     print("\nTotal products found:", len(product_found), "out of", len(urls))
 
 
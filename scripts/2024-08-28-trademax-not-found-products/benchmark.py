@@ -0,0 +1,73 @@
+"""Compare the sequential search loop with the concurrent engine, offline.
+
+Both run against a local replay server that answers like trademax.se: SKUs from
+`products_found.csv` get a search page listing the product, every other SKU gets
+the recorded empty search page from the 2024-03-19 run.
+
+    python benchmark.py [number_of_skus] [latency_seconds]
+"""
+
+import csv
+import os
+import sys
+import time
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(dir_path, ".."))
+
+from lookup.benchmark import trademax_routes
+from lookup.engine import LookupEngine, run_lookups
+from lookup.replay_server import ReplayResponse, ReplayServer
+
+EMPTY_SEARCH_PAGE = os.path.join(
+    dir_path, "..", "2024-03-19-trademax-not-found-products", "tmp.html"
+)
+
+
+def main():
+    n_skus = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+
+    with open(os.path.join(dir_path, "products_found.csv")) as f:
+        found = {sku: url for sku, url in csv.reader(f)}
+    with open(os.path.join(dir_path, "products_not_found.csv")) as f:
+        not_found = [line.strip() for line in f if line.strip()]
+    with open(EMPTY_SEARCH_PAGE, "rb") as f:
+        empty_page = f.read()
+
+    skus = (list(found) + not_found)[:n_skus]
+    routes = trademax_routes(found, empty_page)
+
+    with ReplayServer(routes, ReplayResponse(empty_page), latency=latency) as server:
+        os.environ["TRADEMAX_BASE_URL"] = server.base_url
+        # Both runs must actually hit the server, as fast as the engine allows
+        os.environ["LOOKUP_CACHE"] = "0"
+        os.environ["LOOKUP_RATE_LIMIT"] = "0"
+        import search
+
+        start = time.perf_counter()
+        sequential = {sku: search.TRADEMAX.search_by_sku(sku) for sku in skus}
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent = run_lookups(
+            skus,
+            search.TRADEMAX.search_by_sku,
+            domain=lambda _: "trademax",
+            engine=LookupEngine(concurrency_per_domain=search.CONCURRENCY_PER_DOMAIN),
+        )
+        concurrent_time = time.perf_counter() - start
+
+    assert sequential == concurrent, "Concurrent engine returned different results"
+
+    n_found = sum(url is not None for url in concurrent.values())
+    print(f"{len(skus)} SKUs, {n_found} found, {latency}s simulated latency")
+    print(f"sequential: {sequential_time:.2f}s ({len(skus) / sequential_time:.1f}/s)")
+    print(
+        f"concurrent: {concurrent_time:.2f}s ({len(skus) / concurrent_time:.1f}/s)"
+        f" with {search.CONCURRENCY_PER_DOMAIN} per domain"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Shared helpers for the one-off retailer lookup scripts in `scripts/`.
+
+The dated script folders are not packages, so they put `scripts/` on `sys.path`
+before importing from here:
+
+    sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+"""
@@ -0,0 +1,343 @@
+"""Benchmark the lookup scripts offline, against a local replay server.
+
+    python -m lookup.benchmark [--latency 0.05] [--jitter 0.02] [--error-rate 0.01]
+                               [--save results.json] [--baseline baseline.json]
+
+Runs the trademax SKU search and the bygghemma product check, each one
+sequentially and through the concurrent engine, against a `ReplayServer`
+that answers like the retailers: recorded pages, with simulated latency,
+jitter, errors and redirects, or pages recorded with `LOOKUP_RECORD` when
+given `--corpus`. Reports requests per second, p50/p95/p99 lookup
+latency and bytes transferred per run: the headers and body bytes the client
+read, and next to it every byte the server wrote. Pages the client abandons
+still cost up to a socket buffer more on the wire than it read, so the
+savings of early exits lie between the two. Save a run with `--save` and
+compare a later one to it with `--baseline`.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+from lookup import client
+from lookup.engine import LookupEngine
+from lookup.replay_server import ReplayResponse, ReplayServer, redirect
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+TRADEMAX_DIR = os.path.join(SCRIPTS_DIR, "2024-08-28-trademax-not-found-products")
+BYGGHEMMA_URLS_FILE = os.path.join(
+    SCRIPTS_DIR, "2024-03-22-bygghemma-not-found-products", "product_urls.csv"
+)
+# A recorded trademax page without any search hit in it
+RECORDED_PAGE = os.path.join(
+    SCRIPTS_DIR, "2024-03-19-trademax-not-found-products", "tmp.html"
+)
+
+# Every Nth checked product is gone (404), and every Nth + N/2 redirects to a category
+CHECK_GONE_EVERY = 10
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    lookups: int
+    errors: int
+    seconds: float
+    requests: int
+    # Bytes the client read, headers included, and bytes the server wrote
+    bytes: int
+    server_bytes: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    @property
+    def lookups_per_second(self) -> float:
+        return self.lookups / self.seconds if self.seconds else 0.0
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def _timed(lookup: Callable[[Any], Any]) -> Callable[[Any], tuple[float, bool]]:
+    def run(key) -> tuple[float, bool]:
+        start = time.perf_counter()
+        try:
+            lookup(key)
+            ok = True
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    return run
+
+
+def _client_bytes() -> int:
+    """Header and body bytes the shared client received so far, from all retailers."""
+    return sum(
+        metrics["bytes"] + metrics["header_bytes"]
+        for metrics in client.metrics_summary().values()
+    )
+
+
+def run_benchmark(
+    name: str,
+    server: ReplayServer,
+    keys: list,
+    lookup: Callable[[Any], Any],
+    engine: Optional[LookupEngine] = None,
+    lookups: Optional[int] = None,
+) -> BenchmarkResult:
+    """Time `lookup` over `keys`, one by one or through `engine` when given.
+
+    `lookups` is the number of inputs the run stands for, when that differs
+    from the number of keys (e.g. variants checked through their parent).
+    """
+    timed = _timed(lookup)
+    server.reset_stats()
+    bytes_before = _client_bytes()
+    start = time.perf_counter()
+    if engine is None:
+        outcomes = [timed(key) for key in keys]
+    else:
+
+        async def collect():
+            results = engine.map(keys, timed, domain=lambda _: "replay")
+            return [result.value async for result in results]
+
+        outcomes = asyncio.run(collect())
+    seconds = time.perf_counter() - start
+
+    latencies = [elapsed * 1000 for elapsed, _ in outcomes]
+    return BenchmarkResult(
+        name=name,
+        lookups=lookups if lookups is not None else len(keys),
+        errors=sum(not ok for _, ok in outcomes),
+        seconds=round(seconds, 3),
+        requests=server.request_count,
+        bytes=_client_bytes() - bytes_before,
+        server_bytes=server.bytes_sent,
+        p50_ms=round(percentile(latencies, 50), 1),
+        p95_ms=round(percentile(latencies, 95), 1),
+        p99_ms=round(percentile(latencies, 99), 1),
+    )
+
+
+def trademax_routes(
+    found: dict[str, str], empty_page: bytes
+) -> dict[str, ReplayResponse]:
+    """Search pages for the found SKUs, each listing its product like trademax does."""
+    routes = {}
+    for sku, url in found.items():
+        uri = urlsplit(url).path.replace("/", "\\/")
+        listing = f'<script>{{"sku_id":"{sku}","uri":"{uri}"}}</script></body>'
+        body = empty_page.replace(b"</body>", listing.encode(), 1)
+        routes[f"/search?q={sku}"] = ReplayResponse(body)
+    return routes
+
+
+def bygghemma_routes(urls: list[str], page: bytes) -> dict[str, ReplayResponse]:
+    """Product pages for the urls, with some of them gone or redirected to a category."""
+    routes = {}
+    for i, url in enumerate(urls):
+        path = urlsplit(url).path
+        if i % CHECK_GONE_EVERY == 0:
+            routes[path] = ReplayResponse(b"Not found", status=404)
+        elif i % CHECK_GONE_EVERY == CHECK_GONE_EVERY // 2:
+            routes[path] = redirect("/inredning-och-belysning/")
+        else:
+            routes[path] = ReplayResponse(page)
+    return routes
+
+
+def _read_trademax_skus(n_skus: int) -> tuple[list[str], dict[str, str]]:
+    with open(os.path.join(TRADEMAX_DIR, "products_found.csv")) as f:
+        found = {sku: url for sku, url in csv.reader(f)}
+    with open(os.path.join(TRADEMAX_DIR, "products_not_found.csv")) as f:
+        not_found = [line.strip() for line in f if line.strip()]
+    return (list(found) + not_found)[:n_skus], found
+
+
+def run_suite(
+    n_skus: int = 200,
+    latency: float = 0.05,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    concurrency: int = 8,
+    seed: int = 0,
+    corpus: Optional[str] = None,
+) -> list[BenchmarkResult]:
+    # Every lookup must actually reach the server, as fast as the engine allows,
+    # and simulated errors must not open the circuit and fail the rest right away
+    os.environ["LOOKUP_CACHE"] = "0"
+    os.environ["LOOKUP_RATE_LIMIT"] = "0"
+    os.environ["LOOKUP_BREAKER"] = "0"
+
+    with open(RECORDED_PAGE, "rb") as f:
+        page = f.read()
+    skus, found = _read_trademax_skus(n_skus)
+    with open(BYGGHEMMA_URLS_FILE, newline="") as f:
+        urls = [row["url"] for row in csv.DictReader(f)]
+
+    routes = trademax_routes(found, page)
+    routes.update(bygghemma_routes(urls, page))
+    if corpus is not None:
+        from lookup.recorder import Corpus
+
+        # Recorded pages replace the synthetic ones wherever they were recorded
+        routes.update(Corpus(corpus).routes())
+    server = ReplayServer(
+        routes,
+        ReplayResponse(page),
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        seed=seed,
+    )
+    with server:
+        os.environ["TRADEMAX_BASE_URL"] = server.base_url
+        os.environ["BYGGHEMMA_BASE_URL"] = server.base_url
+        from lookup import retailers
+        from lookup.variants import check_group, group_by_parent
+
+        trademax = retailers.get("trademax")
+        bygghemma = retailers.get("bygghemma")
+        local_urls = [server.base_url + urlsplit(url).path for url in urls]
+        groups = [
+            tuple(variants)
+            for variants in group_by_parent(bygghemma, local_urls).values()
+        ]
+
+        def engine():
+            return LookupEngine(concurrency_per_domain=concurrency)
+
+        return [
+            run_benchmark(
+                "trademax_search/sequential", server, skus, trademax.search_by_sku
+            ),
+            run_benchmark(
+                "trademax_search/engine",
+                server,
+                skus,
+                trademax.search_by_sku,
+                engine(),
+            ),
+            run_benchmark(
+                "bygghemma_check/sequential",
+                server,
+                local_urls,
+                bygghemma.check_product,
+            ),
+            run_benchmark(
+                "bygghemma_check/engine",
+                server,
+                local_urls,
+                bygghemma.check_product,
+                engine(),
+            ),
+            run_benchmark(
+                "bygghemma_check/engine_by_parent",
+                server,
+                groups,
+                lambda variants: check_group(bygghemma, variants),
+                engine(),
+                lookups=len(local_urls),
+            ),
+        ]
+
+
+def print_results(
+    results: list[BenchmarkResult], baseline: Optional[dict[str, dict]] = None
+):
+    header = (
+        f"{'benchmark':<34} {'lookups':>7} {'errors':>6} {'requests':>8} {'req/s':>8}"
+        f" {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'KB':>9} {'server KB':>9}"
+    )
+    if baseline:
+        header += f" {'req/s vs base':>14} {'p95 vs base':>12}"
+    print(header)
+    for r in results:
+        line = (
+            f"{r.name:<34} {r.lookups:>7} {r.errors:>6} {r.requests:>8}"
+            f" {r.requests_per_second:>8.1f}"
+            f" {r.p50_ms:>8.1f} {r.p95_ms:>8.1f} {r.p99_ms:>8.1f}"
+            f" {r.bytes / 1024:>9.0f} {r.server_bytes / 1024:>9.0f}"
+        )
+        base = (baseline or {}).get(r.name)
+        if base:
+            line += (
+                f" {_change(r.requests_per_second, base['requests_per_second']):>14}"
+                f" {_change(r.p95_ms, base['p95_ms']):>12}"
+            )
+        print(line)
+
+
+def _change(value: float, base: float) -> str:
+    if not base:
+        return "-"
+    return f"{(value - base) / base:+.0%}"
+
+
+def _as_dict(result: BenchmarkResult) -> dict:
+    return {
+        **asdict(result),
+        "requests_per_second": round(result.requests_per_second, 2),
+        "lookups_per_second": round(result.lookups_per_second, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skus", type=int, default=200, help="trademax SKUs to search")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8, help="per domain")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--corpus", help="replay the pages recorded in this LOOKUP_RECORD corpus"
+    )
+    parser.add_argument("--save", help="write the results to this json file")
+    parser.add_argument("--baseline", help="compare to results saved with --save")
+    args = parser.parse_args()
+
+    settings = {
+        "n_skus": args.skus,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "corpus": args.corpus,
+    }
+    results = run_suite(**settings)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {"settings": settings, "results": [_as_dict(r) for r in results]},
+                f,
+                indent=2,
+            )
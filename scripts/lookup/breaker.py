@@ -0,0 +1,189 @@
+"""Circuit breakers, so that a failing retailer is paused instead of hammered.
+
+Each retailer domain gets a `CircuitBreaker` that keeps the outcome of the
+requests sent to it over a sliding window. When too many of them failed
+(blocked, throttled, server errors or no response at all), the circuit
+opens and requests to that retailer raise `CircuitOpen` right away. After
+`OPEN_FOR` seconds a single probe request is let through (half-open): if it
+succeeds the circuit closes again, otherwise it stays open twice as long.
+Only the probe's own outcome counts: `before_request` hands it a token to
+record it with, and to `release` its slot if it ends without one.
+
+The engine puts lookups that failed this way in a retry queue, see
+`LookupEngine`.
+"""
+
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Optional
+from urllib.parse import urlsplit
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Outcomes are kept for this many seconds
+WINDOW = 60.0
+# The circuit only opens once the window holds this many outcomes...
+MIN_REQUESTS = 10
+# ...and at least this share of them failed
+FAILURE_RATIO = 0.5
+
+# Seconds the circuit stays open before a probe, doubled after each failed probe
+OPEN_FOR = 30.0
+MAX_OPEN_FOR = 600.0
+
+# Blocked by anti-bot, throttled, or the retailer is struggling
+FAILURE_STATUS_CODES = (403, 429)
+
+
+def is_failure(status_code: int) -> bool:
+    return status_code in FAILURE_STATUS_CODES or status_code >= 500
+
+
+class State(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class RequestError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"Request error, status_code: {status_code}")
+        self.status_code = status_code
+
+
+class CircuitOpen(Exception):
+    def __init__(self, domain: str, retry_in: float):
+        super().__init__(f"Circuit open for {domain}, retry in {retry_in:.0f}s")
+        self.domain = domain
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker over the outcomes of the last `window` seconds."""
+
+    def __init__(
+        self,
+        domain: str,
+        window: float = WINDOW,
+        min_requests: int = MIN_REQUESTS,
+        failure_ratio: float = FAILURE_RATIO,
+        open_for: float = OPEN_FOR,
+        max_open_for: float = MAX_OPEN_FOR,
+    ):
+        self.domain = domain
+        self.window = window
+        self.min_requests = min_requests
+        self.failure_ratio = failure_ratio
+        self.open_for = open_for
+        self.max_open_for = max_open_for
+        self.state = State.CLOSED
+        self.opened_for = open_for
+
+        self._lock = threading.Lock()
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._opened_until = 0.0
+        self._probe: Optional[object] = None
+
+    def before_request(self) -> Optional[object]:
+        """Raise `CircuitOpen` unless a request may be sent now.
+
+        Returns the probe token when the request is the half-open probe, else None.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == State.CLOSED:
+                return None
+            if self.state == State.OPEN and now >= self._opened_until:
+                self.state = State.HALF_OPEN
+            if self.state == State.HALF_OPEN and self._probe is None:
+                self._probe = object()
+                return self._probe
+            retry_in = max(self._opened_until - now, 0.0)
+        raise CircuitOpen(self.domain, retry_in)
+
+    def release(self, probe: object):
+        """Free the half-open slot of `probe` if it ended without recording an outcome."""
+        with self._lock:
+            if self._probe is probe:
+                self._probe = None
+
+    def record(self, success: bool, probe: Optional[object] = None) -> Optional[State]:
+        """Record the outcome of a request, returning the new state when it changed.
+
+        Pass the token `before_request` returned, if any.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == State.HALF_OPEN and probe is not None:
+                if probe is not self._probe:
+                    return None
+                self._probe = None
+                if success:
+                    self.state = State.CLOSED
+                    self._outcomes.clear()
+                    self.opened_for = self.open_for
+                else:
+                    self.opened_for = min(self.opened_for * 2, self.max_open_for)
+                    self._open(now)
+                return self.state
+
+            if self.state != State.CLOSED:
+                # Sent before the circuit opened, or a probe that came back late
+                return None
+
+            self._outcomes.append((now, success))
+            while self._outcomes[0][0] < now - self.window:
+                self._outcomes.popleft()
+            failures = sum(not ok for _, ok in self._outcomes)
+            if (
+                len(self._outcomes) >= self.min_requests
+                and failures / len(self._outcomes) >= self.failure_ratio
+            ):
+                self._open(now)
+                return self.state
+            return None
+
+    def _open(self, now: float):
+        self.state = State.OPEN
+        self._opened_until = now + self.opened_for
+
+
+class CircuitBreakers:
+    """One `CircuitBreaker` per retailer domain."""
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        # Not engine.domain_of: the engine imports this module
+        domain = urlsplit(url).netloc
+        with self._lock:
+            if domain not in self._breakers:
+                self._breakers[domain] = CircuitBreaker(domain)
+            return self._breakers[domain]
+
+    def before_request(self, url: str) -> Optional[object]:
+        return self.breaker(url).before_request()
+
+    def release(self, url: str, probe: object):
+        self.breaker(url).release(probe)
+
+    def record(self, url: str, success: bool, probe: Optional[object] = None):
+        breaker = self.breaker(url)
+        state = breaker.record(success, probe)
+        if state == State.OPEN:
+            logger.warning(
+                "Circuit open, pausing retailer",
+                domain=breaker.domain,
+                seconds=breaker.opened_for,
+            )
+        elif state == State.CLOSED:
+            logger.info("Circuit closed, resuming retailer", domain=breaker.domain)
+
+    def states(self) -> dict[str, str]:
+        return {domain: b.state.value for domain, b in self._breakers.items()}
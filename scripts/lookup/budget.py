@@ -0,0 +1,141 @@
+"""Bandwidth budgets, so that bulk runs cannot blow the proxy traffic quota.
+
+Every retailer domain gets a byte budget for the run, and the run as a whole
+can get one too. The shared client charges the bytes it downloads against
+them and degrades as a budget runs out:
+
+1. `Mode.FULL` until `HEADERS_ONLY_AT` of the budget is spent
+2. `Mode.HEADERS_ONLY`: HEAD checks and streamed GETs closed before the body
+3. `Mode.CACHE_ONLY` once the budget is spent: only cached responses
+
+A request the mode no longer allows raises `HeadersOnly` or `BudgetExceeded`
+before it is sent. Both are `LookupSkipped`: the engine skips that lookup and
+goes on with the others, so lookups answered from the cache still are.
+"""
+
+import os
+import threading
+from enum import IntEnum
+from typing import Optional
+
+import structlog
+
+from lookup.engine import LookupSkipped, domain_of
+
+logger = structlog.get_logger()
+
+MB = 1024 * 1024
+
+# CHANGE THIS for retailers whose traffic goes through a metered proxy
+RETAILER_BUDGETS = {
+    "www.trademax.se": 500 * MB,
+}
+DEFAULT_BUDGET = 2048 * MB
+
+# Share of a budget after which only headers are downloaded
+HEADERS_ONLY_AT = 0.8
+
+
+class Mode(IntEnum):
+    FULL = 0
+    HEADERS_ONLY = 1
+    CACHE_ONLY = 2
+
+
+class BudgetExceeded(LookupSkipped):
+    def __init__(self, domain: str, mode: Mode):
+        super().__init__(f"Bandwidth budget for {domain} exceeded, mode: {mode.name}")
+        self.domain = domain
+        self.mode = mode
+
+
+class HeadersOnly(LookupSkipped):
+    def __init__(self, domain: str):
+        super().__init__(f"Bandwidth budget for {domain} allows only headers")
+        self.domain = domain
+
+
+class BandwidthBudget:
+    """Bytes downloaded per retailer domain, against per-domain and per-run budgets.
+
+    Safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[dict[str, int]] = None,
+        default_budget: int = DEFAULT_BUDGET,
+        run_budget: Optional[int] = None,
+    ):
+        self.budgets = RETAILER_BUDGETS if budgets is None else budgets
+        self.default_budget = default_budget
+        self.run_budget = run_budget
+        self.spent: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _mode(self, domain: str) -> Mode:
+        used = self.spent.get(domain, 0) / self.budgets.get(domain, self.default_budget)
+        if self.run_budget is not None:
+            used = max(used, sum(self.spent.values()) / self.run_budget)
+        if used >= 1:
+            return Mode.CACHE_ONLY
+        if used >= HEADERS_ONLY_AT:
+            return Mode.HEADERS_ONLY
+        return Mode.FULL
+
+    def mode(self, url: str) -> Mode:
+        with self._lock:
+            return self._mode(domain_of(url))
+
+    def allows(self, url: str, mode: Mode) -> bool:
+        """Whether a request that needs at most `mode` may still be sent to `url`."""
+        return self.mode(url) <= mode
+
+    def require(self, url: str, mode: Mode):
+        current = self.mode(url)
+        if current == Mode.HEADERS_ONLY and mode == Mode.FULL:
+            raise HeadersOnly(domain_of(url))
+        if current > mode:
+            raise BudgetExceeded(domain_of(url), current)
+
+    def spend(self, url: str, n_bytes: int):
+        domain = domain_of(url)
+        with self._lock:
+            before = self._mode(domain)
+            self.spent[domain] = spent = self.spent.get(domain, 0) + n_bytes
+            after = self._mode(domain)
+
+        if after != before:
+            logger.warning(
+                "Bandwidth budget running out",
+                domain=domain,
+                mode=after.name,
+                spent_mb=round(spent / MB, 1),
+                budget_mb=round(self.budgets.get(domain, self.default_budget) / MB, 1),
+            )
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                domain: {
+                    "spent_bytes": spent,
+                    "budget_bytes": self.budgets.get(domain, self.default_budget),
+                    "mode": self._mode(domain).name,
+                }
+                for domain, spent in sorted(self.spent.items())
+            }
+
+
+def from_env() -> BandwidthBudget:
+    """The budget set up by the environment.
+
+    `LOOKUP_BUDGET_MB` replaces every per-retailer budget, and
+    `LOOKUP_RUN_BUDGET_MB` caps the bytes of all retailers together.
+    """
+    budgets, default_budget = None, DEFAULT_BUDGET
+    if os.getenv("LOOKUP_BUDGET_MB"):
+        budgets, default_budget = {}, int(float(os.environ["LOOKUP_BUDGET_MB"]) * MB)
+    run_budget = None
+    if os.getenv("LOOKUP_RUN_BUDGET_MB"):
+        run_budget = int(float(os.environ["LOOKUP_RUN_BUDGET_MB"]) * MB)
+    return BandwidthBudget(budgets, default_budget, run_budget)
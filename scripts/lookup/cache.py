@@ -0,0 +1,212 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from lookup.engine import domain_of
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "..", ".cache", "responses.sqlite"
+)
+
+DAY = 24 * 60 * 60
+
+# How long a cached page stays valid, per retailer host
+RETAILER_TTLS = {
+    "www.trademax.se": 7 * DAY,
+    "www.bygghemma.se": 7 * DAY,
+    "www.ellos.se": 1 * DAY,
+}
+DEFAULT_TTL = 1 * DAY
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+# The body is stored decoded, so these no longer describe it
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def _key(url: str, method: str) -> str:
+    """GET responses are keyed by the bare url, other methods get their own entry."""
+    return url if method == "GET" else f"{method} {url}"
+
+
+def is_cacheable(response: requests.Response) -> bool:
+    """Cache real answers (found, redirected, gone), never throttling or server errors."""
+    return response.status_code < 400 or response.status_code == 404
+
+
+class ResponseCache:
+    """URL-keyed response cache in SQLite with per-retailer TTLs and LRU eviction.
+
+    Entries older than their retailer's TTL count as misses. When the stored
+    bodies exceed `max_bytes`, the least recently read entries are evicted.
+
+    An entry can be partial: the status, final url and headers of a streamed
+    response with only the part of the body the caller read (maybe none).
+    Only callers that ask for partial entries get them.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttls: Optional[dict[str, int]] = None,
+        default_ttl: int = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttls = RETAILER_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status_code INTEGER NOT NULL,
+                final_url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                complete INTEGER NOT NULL DEFAULT 1
+            )
+            """)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(responses)")]
+        if "complete" not in columns:
+            # Caches created before partial entries existed
+            self._db.execute(
+                "ALTER TABLE responses ADD COLUMN complete INTEGER NOT NULL DEFAULT 1"
+            )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._db.commit()
+        (self._size,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    def ttl(self, url: str) -> int:
+        return self.ttls.get(domain_of(url), self.default_ttl)
+
+    def get(
+        self, url: str, method: str = "GET", partial: bool = False
+    ) -> Optional[requests.Response]:
+        """The cached response, or None. Partial entries only count with `partial`.
+
+        The body of a partial response is the part that was read, and its
+        `partial` attribute is True.
+        """
+        key = _key(url, method)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status_code, final_url, headers, body, fetched_at, complete"
+                " FROM responses WHERE url = ?",
+                (key,),
+            ).fetchone()
+            if (
+                row is None
+                or row[4] + self.ttl(url) < now
+                or (not row[5] and not partial)
+            ):
+                self.misses += 1
+                return None
+
+            self._db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?", (now, key)
+            )
+            self._db.commit()
+            self.hits += 1
+
+        status_code, final_url, headers, body, _, complete = row
+        response = requests.Response()
+        response.status_code = status_code
+        response.url = final_url
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = body
+        response._content_consumed = True
+        response.partial = not complete
+        return response
+
+    def contains(self, url: str, method: str = "GET") -> bool:
+        """Whether a fresh response is stored for `url`, without counting a hit or miss."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fetched_at FROM responses WHERE url = ?", (_key(url, method),)
+            ).fetchone()
+        return row is not None and row[0] + self.ttl(url) >= time.time()
+
+    def put(
+        self,
+        url: str,
+        response: requests.Response,
+        method: str = "GET",
+        partial_body: Optional[bytes] = None,
+    ):
+        """Store a response, as a partial entry when given the `partial_body` read."""
+        key = _key(url, method)
+        body = response.content if partial_body is None else partial_body
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_HEADERS
+        }
+        now = time.time()
+        with self._lock:
+            old = self._db.execute(
+                "SELECT size FROM responses WHERE url = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.status_code,
+                    response.url,
+                    json.dumps(headers),
+                    body,
+                    len(body),
+                    now,
+                    now,
+                    partial_body is None,
+                ),
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        while self._size > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for url, size in rows:
+                self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._size -= size
+                if self._size <= self.max_bytes:
+                    break
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "size_bytes": self._size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
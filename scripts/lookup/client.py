@@ -0,0 +1,429 @@
+import atexit
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from lookup.breaker import CircuitBreakers, is_failure
+from lookup.budget import BandwidthBudget, Mode
+from lookup.budget import from_env as budget_from_env
+from lookup.cache import DEFAULT_CACHE_PATH, ResponseCache, is_cacheable
+from lookup.metrics import Metrics
+from lookup.ratelimit import RateLimiter
+
+try:
+    import brotli  # noqa: F401 (urllib3 decodes "br" bodies when this is installed)
+
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_REQUEST_HEADER = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36",
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+# (connect, read) timeout in seconds, used when a call does not pass its own
+DEFAULT_TIMEOUT = (5, 30)
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Keep-alive connections kept open per retailer host. Should be at least the
+# per-domain concurrency of the lookup engine, otherwise connections get dropped
+# and re-established under load.
+POOL_MAXSIZE = 32
+
+DNS_CACHE_TTL = 300
+
+# Throttled or failing requests are retried after the rate limiter has backed off
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+MAX_ATTEMPTS = 3
+
+_dns_cache: dict[tuple, tuple[float, list]] = {}
+_dns_lock = threading.Lock()
+_original_getaddrinfo = socket.getaddrinfo
+
+
+def _cached_getaddrinfo(*args, **kwargs):
+    key = (args, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+    with _dns_lock:
+        cached = _dns_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+    result = _original_getaddrinfo(*args, **kwargs)
+    with _dns_lock:
+        _dns_cache[key] = (now + DNS_CACHE_TTL, result)
+    return result
+
+
+def install_dns_cache():
+    """Resolve each retailer host once per `DNS_CACHE_TTL` instead of once per connection."""
+    socket.getaddrinfo = _cached_getaddrinfo
+
+
+class PooledSession(requests.Session):
+    """`requests.Session` with connection pooling, default headers and a default timeout."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, pool_maxsize: int = POOL_MAXSIZE):
+        super().__init__()
+        self.timeout = timeout
+        self.headers.update(DEFAULT_REQUEST_HEADER)
+
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+_session: Optional[PooledSession] = None
+_session_lock = threading.Lock()
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+_breakers: Optional[CircuitBreakers] = None
+_breakers_lock = threading.Lock()
+
+_budget: Optional[BandwidthBudget] = None
+_budget_lock = threading.Lock()
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+_sent = threading.local()
+
+
+def get_session() -> PooledSession:
+    """The process-wide session shared by every retailer lookup."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            install_dns_cache()
+            _session = PooledSession()
+        return _session
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """The shared on-disk response cache, or None when disabled with `LOOKUP_CACHE=0`."""
+    global _cache
+    if os.getenv("LOOKUP_CACHE", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(os.getenv("LOOKUP_CACHE_PATH", DEFAULT_CACHE_PATH))
+        return _cache
+
+
+def requests_sent() -> int:
+    """How many requests the calling thread has sent so far, retries included."""
+    return getattr(_sent, "count", 0)
+
+
+def cache_stats() -> dict:
+    cache = get_cache()
+    return cache.stats() if cache is not None else {}
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """The shared per-retailer rate limiter, or None when disabled with `LOOKUP_RATE_LIMIT=0`."""
+    global _rate_limiter
+    if os.getenv("LOOKUP_RATE_LIMIT", "1") == "0":
+        return None
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
+
+
+def get_recorder():
+    """The corpus responses are recorded into with `LOOKUP_RECORD=1` (or a path), or None."""
+    global _recorder
+    setting = os.getenv("LOOKUP_RECORD", "0")
+    if setting == "0":
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            from lookup.recorder import DEFAULT_CORPUS_PATH, Corpus
+
+            _recorder = Corpus(DEFAULT_CORPUS_PATH if setting == "1" else setting)
+        return _recorder
+
+
+def _record(method: str, url: str, response: requests.Response):
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.record(method, url, response)
+
+
+def get_breakers() -> Optional[CircuitBreakers]:
+    """The shared per-retailer circuit breakers, or None when disabled with `LOOKUP_BREAKER=0`."""
+    global _breakers
+    if os.getenv("LOOKUP_BREAKER", "1") == "0":
+        return None
+    with _breakers_lock:
+        if _breakers is None:
+            _breakers = CircuitBreakers()
+        return _breakers
+
+
+def get_budget() -> Optional[BandwidthBudget]:
+    """The bandwidth budget of this run, or None when disabled with `LOOKUP_BUDGET=0`."""
+    global _budget
+    if os.getenv("LOOKUP_BUDGET", "1") == "0":
+        return None
+    with _budget_lock:
+        if _budget is None:
+            _budget = budget_from_env()
+        return _budget
+
+
+def _require(url: str, mode: Mode):
+    """Raise `HeadersOnly` or `BudgetExceeded` unless the budget allows `mode` requests."""
+    budget = get_budget()
+    if budget is not None:
+        budget.require(url, mode)
+
+
+def get_metrics() -> Metrics:
+    """The request metrics of this run, written at exit to the path in `LOOKUP_METRICS`."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+            path = os.getenv("LOOKUP_METRICS")
+            if path:
+                atexit.register(_metrics.export, path)
+        return _metrics
+
+
+def metrics_summary() -> dict:
+    return get_metrics().summary()
+
+
+def _header_bytes(response: requests.Response) -> int:
+    """Roughly the bytes of the response headers, redirects included."""
+    return sum(
+        sum(len(name) + len(value) + 4 for name, value in r.headers.items())
+        for r in (*response.history, response)
+    )
+
+
+def _observe_size(url: str, response: requests.Response, body: bool = True):
+    """Count the headers and the body bytes received, the body as far as it was read.
+
+    Bodies count as sent over the wire, compressed. Both are charged against
+    the bandwidth budget.
+    """
+    size = 0
+    raw = getattr(response, "raw", None)
+    if body and raw is not None and hasattr(raw, "tell"):
+        size = raw.tell()
+        get_metrics().observe_size(url, size)
+    header_bytes = _header_bytes(response)
+    get_metrics().observe_headers(url, header_bytes)
+    budget = get_budget()
+    if budget is not None:
+        budget.spend(url, size + header_bytes)
+
+
+def _observe_cache(url: str, hit: bool):
+    get_metrics().observe_cache(url, hit)
+
+
+def retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds to wait according to the `Retry-After` header, if there is one."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _send(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the circuit breaker and rate limiter, retrying when throttled.
+
+    Raises `CircuitOpen` while the retailer's circuit is open.
+    """
+    breakers = get_breakers()
+    rate_limiter = get_rate_limiter()
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        probe = None
+        if breakers is not None:
+            probe = breakers.before_request(url)
+        try:
+            if rate_limiter is not None:
+                rate_limiter.acquire(url)
+
+            start = time.monotonic()
+            _sent.count = requests_sent() + 1
+            try:
+                response = get_session().request(method, url, **kwargs)
+            except requests.RequestException:
+                if breakers is not None:
+                    breakers.record(url, success=False, probe=probe)
+                raise
+            elapsed = time.monotonic() - start
+            if breakers is not None:
+                success = not is_failure(response.status_code)
+                breakers.record(url, success=success, probe=probe)
+        finally:
+            # A probe that ended without an outcome lets the next request probe
+            if probe is not None:
+                breakers.release(url, probe)
+        get_metrics().observe_response(
+            url, response.status_code, elapsed, len(response.history)
+        )
+        if rate_limiter is not None:
+            rate_limiter.observe(
+                url, response.status_code, elapsed, retry_after(response)
+            )
+
+        if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_ATTEMPTS:
+            return response
+        response.close()
+
+
+def get(url: str, use_cache: bool = True, **kwargs) -> requests.Response:
+    cache = get_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get(url)
+        _observe_cache(url, cached is not None)
+        if cached is not None:
+            return cached
+
+    _require(url, Mode.FULL)
+    response = _send("GET", url, **kwargs)
+    _observe_size(url, response)
+    _record("GET", url, response)
+    if cache is not None and is_cacheable(response):
+        cache.put(url, response)
+    return response
+
+
+def head(url: str, use_cache: bool = True, **kwargs) -> requests.Response:
+    """HEAD `url`, following redirects, so only the headers are transferred."""
+    cache = get_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get(url, method="HEAD")
+        _observe_cache(url, cached is not None)
+        if cached is not None:
+            return cached
+
+    _require(url, Mode.HEADERS_ONLY)
+    response = _send("HEAD", url, allow_redirects=True, **kwargs)
+    _observe_size(url, response, body=False)
+    _record("HEAD", url, response)
+    if cache is not None and is_cacheable(response):
+        cache.put(url, response, method="HEAD")
+    return response
+
+
+@contextmanager
+def stream(
+    url: str, use_cache: bool = True, mode: Mode = Mode.HEADERS_ONLY, **kwargs
+) -> Iterator[requests.Response]:
+    """GET `url` without downloading the body up front.
+
+    Read the body with `read_until`. The connection is closed when the block
+    exits, so a caller that stops reading early never downloads the rest.
+    What was read is still cached, as a partial entry: the status, final
+    url and headers that answer a redirect or existence check, and the start
+    of the body that answered a scan. Only streams use partial entries.
+
+    Pass `mode=Mode.FULL` when the body is going to be read, so that the
+    request is not sent at all once the budget allows only headers.
+    """
+    cache = get_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get(url, partial=True)
+        _observe_cache(url, cached is not None)
+        if cached is not None:
+            yield cached
+            return
+
+    _require(url, mode)
+    response = _send("GET", url, stream=True, **kwargs)
+    try:
+        yield response
+        if get_recorder() is not None and response._content is False:
+            # Never read by the caller: download it anyway, so that it is recorded
+            response.content
+    finally:
+        response.close()
+        _observe_size(url, response)
+
+    if response._content_consumed:
+        _record("GET", url, response)
+
+    if cache is not None and is_cacheable(response):
+        if response._content_consumed:
+            cache.put(url, response)
+        else:
+            cache.put(url, response, partial_body=getattr(response, "prefix", b""))
+
+
+def read_until(
+    response: requests.Response,
+    feed: Callable[[bytes], bool],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> bool:
+    """Pass the body to `feed` chunk by chunk until it returns True.
+
+    Returns whether `feed` was satisfied. When the body is exhausted instead,
+    it is kept on the response so that it can be cached. When `feed` is
+    satisfied early, the part read so far is kept as `response.prefix`. While
+    recording, the rest of the body is still downloaded after `feed` is
+    satisfied, so that whole pages are recorded.
+
+    A partial cached response is fed its stored prefix; if that is not
+    enough, the whole page is fetched and the rest of it fed too.
+    """
+    if response._content_consumed:
+        content = response.content
+        if any(feed(chunk) for chunk in _slices(content, chunk_size)):
+            return True
+        if not getattr(response, "partial", False):
+            return False
+        rest = get(response.url).content[len(content) :]
+        return any(feed(chunk) for chunk in _slices(rest, chunk_size))
+
+    _require(response.url, Mode.FULL)
+    recording = get_recorder() is not None
+    satisfied = False
+    chunks = []
+    for chunk in response.iter_content(chunk_size):
+        chunks.append(chunk)
+        if not satisfied and feed(chunk):
+            satisfied = True
+            if not recording:
+                response.prefix = b"".join(chunks)
+                return True
+
+    response._content = b"".join(chunks)
+    return satisfied
+
+
+def _slices(content: bytes, chunk_size: int) -> Iterator[bytes]:
+    for start in range(0, len(content), chunk_size):
+        yield content[start : start + chunk_size]
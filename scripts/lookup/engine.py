@@ -0,0 +1,217 @@
+import asyncio
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Hashable, Iterable, Optional
+from urllib.parse import urlsplit
+
+import requests
+import structlog
+
+from lookup.breaker import CircuitOpen, RequestError
+
+logger = structlog.get_logger()
+
+DEFAULT_CONCURRENCY_PER_DOMAIN = 8
+DEFAULT_MAX_IN_FLIGHT = 64
+
+# Lookups failing with these are put in the retry queue instead of stopping the run
+RETRY_ON = (CircuitOpen, RequestError, requests.RequestException)
+MAX_RETRIES = 3
+# Seconds before a failed lookup is retried, unless its circuit says otherwise
+RETRY_DELAY = 5.0
+# Seconds a lookup may wait on open circuits in total before it is given up
+MAX_CIRCUIT_WAIT = 180.0
+
+_EXHAUSTED = object()
+
+
+class LookupSkipped(Exception):
+    """Raised by a lookup that was left undone on purpose; the run goes on without it."""
+
+
+def domain_of(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+@dataclass
+class LookupResult:
+    key: Hashable
+    domain: str
+    value: Optional[str]
+    elapsed: float
+    # Set when the lookup was skipped or still failed after its last retry;
+    # `value` is None then
+    error: Optional[Exception] = None
+
+
+class LookupEngine:
+    """Run many blocking lookups at once, with a concurrency cap per retailer domain.
+
+    The lookup functions stay plain synchronous `requests` code; the engine runs
+    them on its own thread pool and uses one asyncio semaphore per domain to
+    decide how many of them may hit the same retailer at the same time.
+    """
+
+    def __init__(
+        self,
+        concurrency_per_domain: int = DEFAULT_CONCURRENCY_PER_DOMAIN,
+        domain_limits: Optional[dict[str, int]] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        retry_on: tuple[type[Exception], ...] = RETRY_ON,
+        max_retries: int = MAX_RETRIES,
+        retry_delay: float = RETRY_DELAY,
+        max_circuit_wait: float = MAX_CIRCUIT_WAIT,
+    ):
+        self.concurrency_per_domain = concurrency_per_domain
+        self.domain_limits = domain_limits or {}
+        self.max_in_flight = max_in_flight
+        self.retry_on = retry_on
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_circuit_wait = max_circuit_wait
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, domain: str) -> asyncio.Semaphore:
+        if domain not in self._semaphores:
+            limit = self.domain_limits.get(domain, self.concurrency_per_domain)
+            self._semaphores[domain] = asyncio.Semaphore(limit)
+        return self._semaphores[domain]
+
+    async def _run_one(
+        self,
+        executor: ThreadPoolExecutor,
+        key: Hashable,
+        domain: str,
+        lookup: Callable[[Any], Optional[str]],
+    ) -> LookupResult:
+        async with self._semaphore(domain):
+            start = time.perf_counter()
+            try:
+                value = await asyncio.get_running_loop().run_in_executor(
+                    executor, lookup, key
+                )
+            except (LookupSkipped, *self.retry_on) as e:
+                return LookupResult(key, domain, None, time.perf_counter() - start, e)
+            return LookupResult(key, domain, value, time.perf_counter() - start)
+
+    def _retry_delay(
+        self,
+        result: LookupResult,
+        attempts: dict[Hashable, int],
+        waited: dict[Hashable, float],
+    ) -> Optional[float]:
+        """Seconds until a failed lookup is retried, or None when it is out of retries."""
+        if isinstance(result.error, CircuitOpen):
+            # Never sent, so it does not count as an attempt, but a retailer
+            # that stays down must not hold the run forever
+            delay = max(result.error.retry_in, self.retry_delay)
+            waited[result.key] = waited.get(result.key, 0.0) + delay
+            if waited[result.key] > self.max_circuit_wait:
+                return None
+            return delay
+        attempts[result.key] = attempts.get(result.key, 0) + 1
+        if attempts[result.key] > self.max_retries:
+            return None
+        return self.retry_delay
+
+    async def map(
+        self,
+        keys: Iterable[Hashable],
+        lookup: Callable[[Any], Optional[str]],
+        domain: Callable[[Any], str],
+    ) -> AsyncIterator[LookupResult]:
+        """Yield a `LookupResult` per key, in completion order.
+
+        Keys are pulled lazily so that at most `max_in_flight` lookups are
+        scheduled at once. A lookup failing with one of `retry_on` goes to a
+        retry queue and runs again after `retry_delay`, up to `max_retries`
+        times; after that its result carries the error. A lookup raising
+        `LookupSkipped` is not retried, its result carries the error right
+        away. A lookup held back by an open circuit waits for it without
+        using up its retries, for up to `max_circuit_wait` seconds in total.
+        Any other exception cancels the remaining lookups and is re-raised to
+        the caller.
+        """
+        keys = iter(keys)
+        pending: set[asyncio.Task] = set()
+        # (due, order, key, domain) of the lookups waiting to be retried
+        retries: list[tuple[float, int, Hashable, str]] = []
+        order = itertools.count()
+        attempts: dict[Hashable, int] = {}
+        waited: dict[Hashable, float] = {}
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+
+        def schedule(key: Hashable, key_domain: str):
+            task = self._run_one(executor, key, key_domain, lookup)
+            pending.add(asyncio.create_task(task))
+
+        try:
+            while True:
+                while (
+                    retries
+                    and retries[0][0] <= loop.time()
+                    and len(pending) < self.max_in_flight
+                ):
+                    _, _, key, key_domain = heapq.heappop(retries)
+                    schedule(key, key_domain)
+                while len(pending) < self.max_in_flight:
+                    key = next(keys, _EXHAUSTED)
+                    if key is _EXHAUSTED:
+                        break
+                    schedule(key, domain(key))
+
+                if not pending:
+                    if not retries:
+                        break
+                    await asyncio.sleep(retries[0][0] - loop.time())
+                    continue
+
+                timeout = max(retries[0][0] - loop.time(), 0) if retries else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result = task.result()
+                    if result.error is not None and not isinstance(
+                        result.error, LookupSkipped
+                    ):
+                        delay = self._retry_delay(result, attempts, waited)
+                        if delay is not None:
+                            due = loop.time() + delay
+                            heapq.heappush(
+                                retries, (due, next(order), result.key, result.domain)
+                            )
+                            continue
+                        logger.warning(
+                            "Lookup failed after retries",
+                            key=result.key,
+                            domain=result.domain,
+                            error=str(result.error),
+                        )
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_lookups(
+    keys: Iterable[Hashable],
+    lookup: Callable[[Any], Optional[str]],
+    domain: Callable[[Any], str],
+    engine: Optional[LookupEngine] = None,
+) -> dict[Hashable, Optional[str]]:
+    """Blocking helper: run all lookups through the engine and collect the results.
+
+    Lookups that still failed after their retries are None.
+    """
+    engine = engine or LookupEngine()
+
+    async def collect():
+        return {r.key: r.value async for r in engine.map(keys, lookup, domain)}
+
+    return asyncio.run(collect())
@@ -0,0 +1,97 @@
+import re
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+import requests
+
+from lookup import client
+from lookup.engine import domain_of
+
+# Headers that anti-bot services set on the pages they serve instead of the real one
+ANTI_BOT_HEADERS = ("cf-mitigated", "x-datadome", "x-px-block")
+ANTI_BOT_STATUS_CODES = (403, 429)
+
+# Status codes a server answers HEAD with when it only supports GET
+HEAD_NOT_SUPPORTED_STATUS_CODES = (405, 501)
+
+_head_not_supported: set[str] = set()
+_head_lock = threading.Lock()
+
+
+class Liveness(Enum):
+    ALIVE = "alive"
+    REDIRECTED_TO_PRODUCT = "redirected_to_product"
+    # Redirected to something that is not a product page, e.g. a category
+    GONE = "gone"
+    NOT_FOUND = "not_found"
+    BLOCKED = "blocked"
+    ERROR = "error"
+
+
+@dataclass
+class ExistenceCheck:
+    url: str
+    liveness: Liveness
+    status_code: int
+    final_url: str
+
+    @property
+    def found_url(self) -> Optional[str]:
+        if self.liveness in (Liveness.ALIVE, Liveness.REDIRECTED_TO_PRODUCT):
+            return self.final_url
+        return None
+
+
+def classify(
+    url: str,
+    response: requests.Response,
+    product_url_pattern: Optional[re.Pattern] = None,
+) -> Liveness:
+    """Classify a product url from the status and headers of its response alone."""
+    if response.status_code in (404, 410):
+        return Liveness.NOT_FOUND
+    if response.status_code in ANTI_BOT_STATUS_CODES or any(
+        name in response.headers for name in ANTI_BOT_HEADERS
+    ):
+        return Liveness.BLOCKED
+    if response.status_code >= 300:
+        return Liveness.ERROR
+
+    if product_url_pattern is not None and not product_url_pattern.search(response.url):
+        return Liveness.GONE
+    if response.url != url:
+        return Liveness.REDIRECTED_TO_PRODUCT
+    return Liveness.ALIVE
+
+
+def check_exists(
+    url: str,
+    product_url_pattern: Optional[re.Pattern] = None,
+    use_head: bool = True,
+) -> ExistenceCheck:
+    """Check whether a product url is still live, without downloading the page.
+
+    Uses HEAD unless the retailer has answered HEAD with 405/501 before, in
+    which case it sends a streamed GET and closes it once the headers arrive.
+    Redirects are followed either way, and `product_url_pattern` tells product
+    pages apart from wherever else a dead product may redirect to.
+    """
+    domain = domain_of(url)
+    if use_head and domain not in _head_not_supported:
+        response = client.head(url)
+        if response.status_code not in HEAD_NOT_SUPPORTED_STATUS_CODES:
+            return _check(url, response, product_url_pattern)
+        with _head_lock:
+            _head_not_supported.add(domain)
+
+    with client.stream(url) as response:
+        return _check(url, response, product_url_pattern)
+
+
+def _check(
+    url: str, response: requests.Response, product_url_pattern: Optional[re.Pattern]
+) -> ExistenceCheck:
+    liveness = classify(url, response, product_url_pattern)
+    return ExistenceCheck(url, liveness, response.status_code, response.url)
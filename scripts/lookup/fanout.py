@@ -0,0 +1,62 @@
+import asyncio
+from typing import Iterable, Iterator, Optional, Sequence
+
+from lookup import retailers
+from lookup.engine import LookupEngine, domain_of
+
+# Searches in flight at once, over all retailers together
+DEFAULT_MAX_IN_FLIGHT = 32
+
+# Cell of a search that failed or was skipped: unlike None, nothing is known
+ERROR = "ERROR"
+
+
+def _pairs(skus: Iterable[str], names: Sequence[str]) -> Iterator[tuple[str, str]]:
+    for sku in skus:
+        for name in names:
+            yield sku, name
+
+
+def _search(key: tuple[str, str]) -> Optional[str]:
+    sku, retailer = key
+    return retailers.get(retailer).search_by_sku(sku)
+
+
+def _domain(key: tuple[str, str]) -> str:
+    sku, retailer = key
+    return domain_of(retailers.get(retailer).search_url(sku))
+
+
+async def fan_out_search(
+    skus: Iterable[str],
+    names: Sequence[str],
+    engine: Optional[LookupEngine] = None,
+) -> dict[str, dict[str, Optional[str]]]:
+    """Search every retailer for every SKU and return a SKU x retailer matrix.
+
+    The searches for one SKU go out to all retailers at the same time. Each
+    retailer still gets at most the engine's per-domain concurrency, and the
+    engine's `max_in_flight` caps the searches in flight over all of them.
+    A cell is the product url found, None when there is none, or `ERROR`
+    when the search failed or was skipped.
+    """
+    unsearchable = [name for name in names if not retailers.get(name).searchable]
+    if unsearchable:
+        raise ValueError(f"No SKU search for retailers: {', '.join(unsearchable)}")
+
+    engine = engine or LookupEngine(max_in_flight=DEFAULT_MAX_IN_FLIGHT)
+    matrix: dict[str, dict[str, Optional[str]]] = {}
+    async for result in engine.map(_pairs(skus, names), _search, _domain):
+        sku, retailer = result.key
+        cell = ERROR if result.error is not None else result.value
+        matrix.setdefault(sku, {})[retailer] = cell
+    return matrix
+
+
+def run_fan_out_search(
+    skus: Iterable[str],
+    names: Sequence[str],
+    engine: Optional[LookupEngine] = None,
+) -> dict[str, dict[str, Optional[str]]]:
+    """Blocking helper around `fan_out_search`."""
+    return asyncio.run(fan_out_search(skus, names, engine))
@@ -0,0 +1,86 @@
+import itertools
+from typing import Iterator, Optional
+
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def read_spreadsheet_chunks(
+    path: str,
+    schema: dict[str, str],
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    sheet_name: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """Read a CSV or Excel file as data frames of at most `chunksize` rows.
+
+    `schema` maps column names to pandas dtypes, so that identifiers are never
+    guessed: declare SKU/EAN/MPN columns as "string" (an SKU like 1324328 stays
+    the text "1324328" instead of becoming an int or float) and low-cardinality
+    columns such as categories as "category". Columns that are not in the
+    schema keep pandas' inferred dtype.
+
+    Only one chunk is held in memory at a time, whatever the file size.
+    """
+    if path.endswith((".xlsx", ".xlsm")):
+        yield from _read_excel_chunks(path, schema, chunksize, sheet_name)
+        return
+
+    for chunk in pd.read_csv(path, dtype=schema, chunksize=chunksize):
+        _check_columns(chunk, schema)
+        yield chunk
+
+
+def _read_excel_chunks(
+    path: str, schema: dict[str, str], chunksize: int, sheet_name: Optional[str]
+) -> Iterator[pd.DataFrame]:
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        while batch := list(itertools.islice(rows, chunksize)):
+            chunk = pd.DataFrame(batch, columns=header)
+            _check_columns(chunk, schema)
+            yield _apply_schema(chunk, schema)
+    finally:
+        workbook.close()
+
+
+def _check_columns(chunk: pd.DataFrame, schema: dict[str, str]):
+    missing = set(schema) - set(chunk.columns)
+    if missing:
+        raise ValueError(f"Columns missing from the spreadsheet: {sorted(missing)}")
+
+
+def _apply_schema(chunk: pd.DataFrame, schema: dict[str, str]) -> pd.DataFrame:
+    for column, dtype in schema.items():
+        if dtype in ("string", "str"):
+            # Excel hands out numeric-looking identifiers as int or float
+            chunk[column] = chunk[column].map(_as_string).astype("string")
+        else:
+            chunk[column] = chunk[column].astype(dtype)
+    return chunk
+
+
+def _as_string(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def peek(
+    chunks: Iterator[pd.DataFrame],
+) -> tuple[Optional[pd.DataFrame], Iterator[pd.DataFrame]]:
+    """The first chunk, for a look at the data, and an iterator over all chunks."""
+    first = next(chunks, None)
+    if first is None:
+        return None, iter(())
+    return first, itertools.chain([first], chunks)
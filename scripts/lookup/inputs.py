@@ -0,0 +1,103 @@
+import csv
+import hashlib
+import json
+import random
+import sys
+from typing import Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def read_identifiers(
+    source: str, column: Optional[str] = None, dedupe: bool = True
+) -> Iterator[str]:
+    """Lazily yield SKUs, EANs, MPNs or urls from a file, one at a time.
+
+    `source` is a path to a `.csv`, `.jsonl` or `.parquet` file, or `-` for
+    stdin. CSV and JSONL rows are read one by one and Parquet files one record
+    batch at a time, so memory use does not grow with the size of the list.
+    `column` picks the CSV column, JSON key or Parquet column to read; without
+    it the first CSV column is used, and JSONL lines must be plain strings.
+    Stdin and any other file are read as one identifier per line.
+
+    Empty values are skipped, and so are repeated values when `dedupe` is set.
+    """
+    if source == "-":
+        identifiers = _read_lines(sys.stdin)
+    elif source.endswith(".csv"):
+        identifiers = _read_csv(source, column)
+    elif source.endswith(".jsonl"):
+        identifiers = _read_jsonl(source, column)
+    elif source.endswith(".parquet"):
+        identifiers = _read_parquet(source, column)
+    else:
+        identifiers = _read_text(source)
+
+    yield from unique(identifiers) if dedupe else identifiers
+
+
+def _read_lines(f) -> Iterator[str]:
+    for line in f:
+        if line.strip():
+            yield line.strip()
+
+
+def _read_text(path: str) -> Iterator[str]:
+    with open(path) as f:
+        yield from _read_lines(f)
+
+
+def _read_csv(path: str, column: Optional[str]) -> Iterator[str]:
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        index = header.index(column) if column is not None else 0
+        for row in reader:
+            if len(row) > index and row[index].strip():
+                yield row[index].strip()
+
+
+def _read_jsonl(path: str, column: Optional[str]) -> Iterator[str]:
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            value = record[column] if column is not None else record
+            if value is not None and str(value).strip():
+                yield str(value).strip()
+
+
+def _read_parquet(path: str, column: Optional[str]) -> Iterator[str]:
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    column = column or parquet_file.schema_arrow.names[0]
+    for batch in parquet_file.iter_batches(columns=[column]):
+        for value in batch.column(0).to_pylist():
+            if value is not None and str(value).strip():
+                yield str(value).strip()
+
+
+def unique(identifiers: Iterable[str]) -> Iterator[str]:
+    """Drop repeated identifiers, remembering only an 8 byte hash of each one seen."""
+    seen: set[int] = set()
+    for identifier in identifiers:
+        digest = hashlib.blake2b(identifier.encode(), digest_size=8).digest()
+        key = int.from_bytes(digest, "little")
+        if key not in seen:
+            seen.add(key)
+            yield identifier
+
+
+def sample(items: Iterable[T], k: int) -> list[T]:
+    """Pick `k` random items from a stream without holding all of it (reservoir sampling)."""
+    reservoir: list[T] = []
+    for i, item in enumerate(items):
+        if i < k:
+            reservoir.append(item)
+        else:
+            j = random.randint(0, i)
+            if j < k:
+                reservoir[j] = item
+    return reservoir
@@ -0,0 +1,88 @@
+import json
+import os
+import time
+from typing import Optional
+
+# Records are fsynced in batches: after this many records or this many seconds,
+# whichever comes first. A crash loses at most one batch, which is then redone.
+FSYNC_EVERY = 50
+FSYNC_INTERVAL = 1.0
+
+
+class Journal:
+    """Append-only JSONL log of lookup outcomes, used to resume interrupted runs.
+
+    Every finished lookup is appended as `{"key": ..., "value": ...}`. On open,
+    the existing log is read back into `completed` so that the run can skip
+    those keys. A torn last line from a crash is cut off before appending.
+    A log that was not written to for `max_age` seconds is from an abandoned
+    run and is started over instead.
+
+        with Journal("search_journal.jsonl") as journal:
+            for sku in skus:
+                if sku not in journal.completed:
+                    journal.record(sku, trademax_search_by_sku(sku))
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fsync_every: int = FSYNC_EVERY,
+        fsync_interval: float = FSYNC_INTERVAL,
+        max_age: Optional[float] = None,
+    ):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.completed: dict[str, Optional[str]] = {}
+
+        if (
+            max_age is not None
+            and os.path.exists(path)
+            and time.time() - os.path.getmtime(path) > max_age
+        ):
+            os.remove(path)
+        self._truncate_torn_tail()
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    record = json.loads(line)
+                    self.completed[record["key"]] = record["value"]
+
+        self._file = open(path, "a")
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _truncate_torn_tail(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            content = f.read()
+            if content and not content.endswith(b"\n"):
+                f.truncate(content.rfind(b"\n") + 1)
+
+    def record(self, key: str, value: Optional[str]):
+        self.completed[key] = value
+        self._file.write(json.dumps({"key": key, "value": value}) + "\n")
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.fsync_every
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self.sync()
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        self._file.close()
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
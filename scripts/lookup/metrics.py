@@ -0,0 +1,225 @@
+"""Where time and bytes go: request metrics per retailer, kept by the shared client.
+
+Every request the client sends is counted under its retailer's domain:
+latency and response size histograms, header bytes, status codes, redirects
+followed and response cache hits and misses. Sizes are bytes received over
+the wire, so compressed bodies and pages abandoned half-way count for what
+they cost.
+
+Set `LOOKUP_METRICS` to a file path to write the metrics when the run exits,
+as a Prometheus textfile (for node_exporter's textfile collector) when the
+path ends in `.prom`, otherwise as a JSON summary.
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from lookup.engine import domain_of
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024)
+
+
+@dataclass
+class Histogram:
+    buckets: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    sum: float = 0.0
+    count: int = 0
+
+    def __post_init__(self):
+        self.counts = self.counts or [0] * len(self.buckets)
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The upper bound of the bucket holding the `q` quantile, None past the last."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, cumulative in zip(self.buckets, self.counts):
+            if cumulative >= rank:
+                return bound
+        return None
+
+
+@dataclass
+class RetailerMetrics:
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    size: Histogram = field(default_factory=lambda: Histogram(SIZE_BUCKETS))
+    status_codes: Counter = field(default_factory=Counter)
+    redirects: int = 0
+    # Roughly, as the headers are parsed: redirects included, HEAD responses too
+    header_bytes: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    def summary(self) -> dict:
+        cache_lookups = self.cache_hits + self.cache_misses
+        return {
+            "requests": self.latency.count,
+            "status_codes": {
+                str(code): n for code, n in sorted(self.status_codes.items())
+            },
+            "redirects": self.redirects,
+            "bytes": int(self.size.sum),
+            "header_bytes": self.header_bytes,
+            "latency_seconds": {
+                "sum": round(self.latency.sum, 3),
+                "mean": (
+                    round(self.latency.sum / self.latency.count, 3)
+                    if self.latency.count
+                    else None
+                ),
+                "p50_at_most": self.latency.quantile(0.5),
+                "p95_at_most": self.latency.quantile(0.95),
+            },
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_ratio": (
+                round(self.cache_hits / cache_lookups, 3) if cache_lookups else None
+            ),
+        }
+
+
+class Metrics:
+    """Request metrics by retailer domain. Safe to update from several threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._retailers: dict[str, RetailerMetrics] = {}
+
+    def _retailer(self, url: str) -> RetailerMetrics:
+        domain = domain_of(url)
+        if domain not in self._retailers:
+            self._retailers[domain] = RetailerMetrics()
+        return self._retailers[domain]
+
+    def observe_response(
+        self, url: str, status_code: int, elapsed: float, redirects: int
+    ):
+        with self._lock:
+            metrics = self._retailer(url)
+            metrics.latency.observe(elapsed)
+            metrics.status_codes[status_code] += 1
+            metrics.redirects += redirects
+
+    def observe_size(self, url: str, n_bytes: int):
+        with self._lock:
+            self._retailer(url).size.observe(n_bytes)
+
+    def observe_headers(self, url: str, n_bytes: int):
+        with self._lock:
+            self._retailer(url).header_bytes += n_bytes
+
+    def observe_cache(self, url: str, hit: bool):
+        with self._lock:
+            metrics = self._retailer(url)
+            if hit:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                domain: metrics.summary()
+                for domain, metrics in sorted(self._retailers.items())
+            }
+
+    def to_prometheus(self) -> str:
+        lines = []
+
+        def metric(name: str, kind: str, help: str):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, attribute: str):
+            for domain, metrics in retailers:
+                h = getattr(metrics, attribute)
+                for bound, count in zip(h.buckets, h.counts):
+                    lines.append(
+                        f'{name}_bucket{{retailer="{domain}",le="{bound}"}} {count}'
+                    )
+                lines.append(
+                    f'{name}_bucket{{retailer="{domain}",le="+Inf"}} {h.count}'
+                )
+                lines.append(f'{name}_sum{{retailer="{domain}"}} {h.sum}')
+                lines.append(f'{name}_count{{retailer="{domain}"}} {h.count}')
+
+        with self._lock:
+            retailers = sorted(self._retailers.items())
+
+            metric(
+                "lookup_request_duration_seconds",
+                "histogram",
+                "Time until the response headers arrived, or the whole body when not streamed.",
+            )
+            histogram("lookup_request_duration_seconds", "latency")
+
+            metric(
+                "lookup_response_bytes",
+                "histogram",
+                "Bytes received over the wire per response body.",
+            )
+            histogram("lookup_response_bytes", "size")
+
+            metric(
+                "lookup_response_header_bytes_total",
+                "counter",
+                "Bytes of response headers received, redirects included.",
+            )
+            for domain, metrics in retailers:
+                lines.append(
+                    f'lookup_response_header_bytes_total{{retailer="{domain}"}} {metrics.header_bytes}'
+                )
+
+            metric("lookup_responses_total", "counter", "Responses by status code.")
+            for domain, metrics in retailers:
+                for code, n in sorted(metrics.status_codes.items()):
+                    lines.append(
+                        f'lookup_responses_total{{retailer="{domain}",code="{code}"}} {n}'
+                    )
+
+            metric("lookup_redirects_total", "counter", "Redirects followed.")
+            for domain, metrics in retailers:
+                lines.append(
+                    f'lookup_redirects_total{{retailer="{domain}"}} {metrics.redirects}'
+                )
+
+            metric(
+                "lookup_cache_lookups_total",
+                "counter",
+                "Response cache lookups by result.",
+            )
+            for domain, metrics in retailers:
+                for result, n in (
+                    ("hit", metrics.cache_hits),
+                    ("miss", metrics.cache_misses),
+                ):
+                    lines.append(
+                        f'lookup_cache_lookups_total{{retailer="{domain}",result="{result}"}} {n}'
+                    )
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str):
+        """Write the metrics to `path`, replacing it in one step so scrapers never see half a file."""
+        if path.endswith(".prom"):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.summary(), indent=2) + "\n"
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
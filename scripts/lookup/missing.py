@@ -0,0 +1,101 @@
+from typing import Iterator, Optional
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from lookup.pg_loader import quote_identifier
+
+logger = structlog.get_logger()
+
+# Rows fetched per round trip from the server-side cursor
+DEFAULT_BATCH_SIZE = 1000
+
+
+def has_index(db: Engine, table: str, columns: list[str]) -> bool:
+    """Whether an index on `table` starts with `columns`, in that order."""
+    query = text(
+        "SELECT 1 FROM pg_index i"
+        " WHERE i.indrelid = to_regclass(:table)"
+        " AND (SELECT array_agg(a.attname::text ORDER BY k.ord)"
+        "      FROM unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)"
+        "      JOIN pg_attribute a"
+        "      ON a.attrelid = i.indrelid AND a.attnum = k.attnum)"
+        f"     [1:{len(columns)}] = CAST(:columns AS text[])"
+    )
+    with db.connect() as conn:
+        row = conn.execute(
+            query, {"table": quote_identifier(table), "columns": columns}
+        ).first()
+    return row is not None
+
+
+def ensure_index(db: Engine, table: str, columns: list[str]):
+    """Index `columns` of `table`, unless an index already starts with them."""
+    if has_index(db, table, columns):
+        return
+    name = "_".join([table, *columns, "idx"]).replace(" ", "_")[:63]
+    column_list = ", ".join(quote_identifier(column) for column in columns)
+    with db.begin() as conn:
+        conn.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS {quote_identifier(name)}"
+                f" ON {quote_identifier(table)} ({column_list})"
+            )
+        )
+
+
+def missing_identifiers(
+    db: Engine,
+    catalog_table: str,
+    catalog_column: str,
+    listings_table: str,
+    listings_column: str,
+    retailer_column: Optional[str] = None,
+    retailer: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    create_index: bool = False,
+) -> Iterator[str]:
+    """Stream the catalog identifiers that the retailer's known listings do not have.
+
+    The missing set is computed in Postgres with an anti-join (`NOT EXISTS`)
+    between an imported catalog table, such as `temp_vd_trademax_2024_08_28`,
+    and the table of known listings, optionally restricted to one retailer.
+    Rows come back through a server-side cursor, `batch_size` at a time, so
+    they can be fed straight into the lookup engine.
+
+    The `NOT EXISTS` probe needs an index on the listings side, on
+    (`listings_column`, `retailer_column`). It is only created with
+    `create_index`; otherwise a missing index is just logged.
+    """
+    index_columns = [listings_column]
+    if retailer_column is not None:
+        index_columns.append(retailer_column)
+    if create_index:
+        ensure_index(db, listings_table, index_columns)
+    elif not has_index(db, listings_table, index_columns):
+        logger.warning(
+            "No index for the anti-join, every probe scans the listings",
+            table=listings_table,
+            columns=index_columns,
+        )
+
+    catalog_id = quote_identifier(catalog_column)
+    listings_id = quote_identifier(listings_column)
+    retailer_filter = ""
+    if retailer_column is not None:
+        retailer_filter = f" AND l.{quote_identifier(retailer_column)} = :retailer"
+
+    query = text(
+        f"SELECT DISTINCT c.{catalog_id} FROM {quote_identifier(catalog_table)} c"
+        f" WHERE c.{catalog_id} IS NOT NULL AND NOT EXISTS ("
+        f"SELECT 1 FROM {quote_identifier(listings_table)} l"
+        f" WHERE l.{listings_id} = c.{catalog_id}{retailer_filter})"
+    )
+
+    with db.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=batch_size
+        ).execute(query, {"retailer": retailer})
+        for (identifier,) in result:
+            yield str(identifier)
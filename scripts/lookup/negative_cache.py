@@ -0,0 +1,116 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Iterator, Optional
+
+DEFAULT_NEGATIVE_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "..", ".cache", "not_found.sqlite"
+)
+
+DAY = 24 * 60 * 60
+
+# A key that was not found is re-checked after 1, 2, 4, ... days, up to 32 days
+BASE_INTERVAL = 1 * DAY
+MAX_INTERVAL = 32 * DAY
+
+
+class NegativeCache:
+    """Remembers lookups that came back "not found", per retailer.
+
+    Every consecutive miss doubles the time until the key is worth searching
+    for again. A key that is found is forgotten. `saved` counts the requests
+    that were not made because a key was still inside its re-check interval.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_NEGATIVE_CACHE_PATH,
+        base_interval: int = BASE_INTERVAL,
+        max_interval: int = MAX_INTERVAL,
+    ):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.saved = 0
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS not_found (
+                retailer TEXT NOT NULL,
+                key TEXT NOT NULL,
+                misses INTEGER NOT NULL,
+                last_checked_at REAL NOT NULL,
+                recheck_at REAL NOT NULL,
+                PRIMARY KEY (retailer, key)
+            )
+            """)
+        self._db.commit()
+
+    def interval(self, misses: int) -> int:
+        return min(self.base_interval * 2 ** (misses - 1), self.max_interval)
+
+    def is_known_missing(self, retailer: str, key: str) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT recheck_at FROM not_found WHERE retailer = ? AND key = ?",
+                (retailer, key),
+            ).fetchone()
+        return row is not None and row[0] > time.time()
+
+    def due(
+        self,
+        retailer: str,
+        keys: Iterable[str],
+        skip: bool = True,
+        skipped: Optional[set[str]] = None,
+    ) -> Iterator[str]:
+        """Yield the keys worth looking up now.
+
+        Known-missing keys are dropped when `skip` is set, and added to `skipped`
+        when given, otherwise they are deprioritised: yielded after every other key.
+        """
+        deferred = []
+        for key in keys:
+            if not self.is_known_missing(retailer, key):
+                yield key
+            elif skip:
+                self.saved += 1
+                if skipped is not None:
+                    skipped.add(key)
+            else:
+                deferred.append(key)
+        yield from deferred
+
+    def record(self, retailer: str, key: str, found: bool):
+        now = time.time()
+        with self._lock:
+            if found:
+                self._db.execute(
+                    "DELETE FROM not_found WHERE retailer = ? AND key = ?",
+                    (retailer, key),
+                )
+            else:
+                row = self._db.execute(
+                    "SELECT misses FROM not_found WHERE retailer = ? AND key = ?",
+                    (retailer, key),
+                ).fetchone()
+                misses = row[0] + 1 if row else 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO not_found VALUES (?, ?, ?, ?, ?)",
+                    (retailer, key, misses, now, now + self.interval(misses)),
+                )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            (known_missing,) = self._db.execute(
+                "SELECT COUNT(*) FROM not_found WHERE recheck_at > ?", (time.time(),)
+            ).fetchone()
+        return {"requests_saved": self.saved, "known_missing": known_missing}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
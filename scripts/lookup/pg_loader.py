@@ -0,0 +1,77 @@
+import io
+import itertools
+from typing import Iterable, Optional
+
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+STAGING_TABLE_NAME = "_staging"
+
+
+def quote_identifier(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def copy_into_table(
+    db: Engine,
+    frames: Iterable[pd.DataFrame],
+    table: str,
+    key_columns: Optional[list[str]] = None,
+    if_exists: str = "fail",
+) -> int:
+    """Bulk load data frames into a Postgres table with `COPY FROM STDIN`.
+
+    Each frame is written as CSV into an in-memory buffer and streamed into a
+    temporary staging table, so only one frame needs to be in memory at a time.
+    The staging table is then merged into `table` in one statement: rows whose
+    `key_columns` already exist are replaced, everything else is inserted.
+    The whole load is one transaction.
+
+    `table` is created from the first frame's columns if it does not exist,
+    and `if_exists` has the same meaning as in `DataFrame.to_sql` ("fail",
+    "replace" or "append"). Returns the number of rows loaded.
+    """
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        return 0
+
+    first.head(0).to_sql(table, con=db, if_exists=if_exists, index=False)
+    columns = ", ".join(quote_identifier(c) for c in first.columns)
+    target, staging = quote_identifier(table), quote_identifier(STAGING_TABLE_NAME)
+
+    n_rows = 0
+    conn = db.raw_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging} (LIKE {target}) ON COMMIT DROP"
+            )
+            for frame in itertools.chain([first], frames):
+                buffer = io.StringIO()
+                frame.to_csv(buffer, index=False, header=False)
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+                n_rows += len(frame)
+
+            if key_columns:
+                matches = " AND ".join(
+                    f"t.{quote_identifier(c)} = s.{quote_identifier(c)}"
+                    for c in key_columns
+                )
+                cursor.execute(
+                    f"DELETE FROM {target} t USING {staging} s WHERE {matches}"
+                )
+            cursor.execute(
+                f"INSERT INTO {target} ({columns}) SELECT {columns} FROM {staging}"
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return n_rows
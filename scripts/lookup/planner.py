@@ -0,0 +1,239 @@
+"""Resolve products to a retailer's product urls, trying the cheapest lookups first.
+
+    python -m lookup.planner products.csv --retailer bygghemma
+
+A product may be known by several identifiers: an EAN, a SKU, an MPN, the
+retailer's own product id, or a product url found earlier. Instead of a
+person picking which identifier to search by, `LookupPlanner` runs a fixed
+cascade for each product and stops at the first certain hit:
+
+1. the retailer's own id in the sitemap index: a local lookup
+2. searches already in the response cache, by any identifier: no request
+3. the known product url, if it still exists: one HEAD request
+4. a search by EAN, then by SKU, then by MPN: one request each
+
+Once the retailer's bandwidth budget runs low, the SKU search (the only one
+that reads the page) is skipped, and once it is spent only the first two
+steps are left.
+"""
+
+import argparse
+import asyncio
+import csv
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+import structlog
+
+from lookup import client, retailers
+from lookup.budget import Mode
+from lookup.engine import LookupEngine, LookupSkipped
+from lookup.sitemap import SitemapIndex
+
+logger = structlog.get_logger()
+
+# The identifiers searched for, in order. Only a SKU can be verified on a search
+# page; an EAN or MPN is a hit only when the search redirects to the product.
+SEARCH_ORDER = ("ean", "sku", "mpn")
+
+
+@dataclass(frozen=True)
+class Product:
+    key: str
+    ean: Optional[str] = None
+    sku: Optional[str] = None
+    mpn: Optional[str] = None
+    # The retailer's own product and variant ids, as found in its product urls
+    product_id: Optional[str] = None
+    variant_id: Optional[str] = None
+    # A product url found earlier, which may or may not still exist
+    url: Optional[str] = None
+
+
+@dataclass
+class Resolution:
+    product: Product
+    url: Optional[str]
+    # Which step of the cascade found the url, e.g. "sitemap" or "search_ean"
+    source: Optional[str]
+    requests: int
+
+
+@dataclass
+class PlannerStats:
+    products: int = 0
+    found: int = 0
+    requests: int = 0
+    # Products whose remaining lookups the bandwidth budget no longer allowed
+    over_budget: int = 0
+    found_by: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "products": self.products,
+            "found": self.found,
+            "requests": self.requests,
+            "over_budget": self.over_budget,
+            "requests_per_found": (
+                round(self.requests / self.found, 2) if self.found else None
+            ),
+            **{f"found_by_{source}": n for source, n in self.found_by.items()},
+        }
+
+
+class LookupPlanner:
+    """Runs the lookup cascade for one retailer. Safe to use from several threads."""
+
+    def __init__(
+        self,
+        retailer: retailers.Retailer,
+        sitemap_index: Optional[SitemapIndex] = None,
+        search_order: Iterable[str] = SEARCH_ORDER,
+    ):
+        self.retailer = retailer
+        self.sitemap_index = sitemap_index
+        self.search_order = tuple(search_order)
+        self.stats = PlannerStats()
+        self._lock = threading.Lock()
+
+    def _searches(self, product: Product) -> Iterator[tuple[str, str]]:
+        if not self.retailer.searchable:
+            return
+        for kind in self.search_order:
+            identifier = getattr(product, kind)
+            if identifier:
+                yield kind, identifier
+
+    def _search(self, kind: str, identifier: str) -> Optional[str]:
+        return self.retailer.search(identifier, scan=kind == "sku")
+
+    def _allows(self, mode: Mode) -> bool:
+        budget = client.get_budget()
+        return budget is None or budget.allows(self.retailer.base_url, mode)
+
+    def _count_over_budget(self):
+        with self._lock:
+            self.stats.over_budget += 1
+
+    def resolve(self, product: Product) -> Resolution:
+        sent = client.requests_sent()
+        try:
+            url, source = self._resolve(product)
+        except LookupSkipped:
+            # The budget ran out for the known url check or the searches
+            url, source = None, None
+            self._count_over_budget()
+        requests = client.requests_sent() - sent
+        with self._lock:
+            self.stats.products += 1
+            self.stats.requests += requests
+            if url is not None:
+                self.stats.found += 1
+                self.stats.found_by[source] = self.stats.found_by.get(source, 0) + 1
+        return Resolution(product, url, source, requests)
+
+    def _resolve(self, product: Product) -> tuple[Optional[str], Optional[str]]:
+        if self.sitemap_index is not None and (
+            product.product_id or product.variant_id
+        ):
+            url = self.sitemap_index.get(
+                self.retailer.name, product.product_id, product.variant_id
+            )
+            if url is not None:
+                return url, "sitemap"
+
+        cache = client.get_cache()
+        searched = set()
+        if cache is not None:
+            for kind, identifier in self._searches(product):
+                if cache.contains(self.retailer.search_url(identifier)):
+                    searched.add(kind)
+                    sent = client.requests_sent()
+                    url = self._search(kind, identifier)
+                    if url is not None:
+                        # A cached page start that does not answer a scan is fetched
+                        if client.requests_sent() > sent:
+                            return url, f"search_{kind}"
+                        return url, f"cached_search_{kind}"
+
+        if product.url:
+            url = self.retailer.check_product(product.url).found_url
+            if url is not None:
+                return url, "known_url"
+
+        over_budget = False
+        for kind, identifier in self._searches(product):
+            if kind in searched:
+                continue
+            # Only a SKU search reads the page, the others need just the redirect
+            if not self._allows(Mode.FULL if kind == "sku" else Mode.HEADERS_ONLY):
+                over_budget = True
+                continue
+            url = self._search(kind, identifier)
+            if url is not None:
+                return url, f"search_{kind}"
+
+        if over_budget:
+            self._count_over_budget()
+        return None, None
+
+
+async def resolve_all(
+    planner: LookupPlanner,
+    products: Iterable[Product],
+    engine: Optional[LookupEngine] = None,
+) -> list[Resolution]:
+    """Resolve many products at once, through the engine's per-domain cap."""
+    engine = engine or LookupEngine()
+    domain = planner.retailer.domain
+    return [
+        result.value or Resolution(result.key, None, None, 0)
+        async for result in engine.map(products, planner.resolve, lambda _: domain)
+    ]
+
+
+def read_products(path: str) -> Iterator[Product]:
+    """Products from a csv whose columns are among the fields of `Product`."""
+    with open(path, newline="") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            values = {
+                name: (row.get(name) or "").strip() or None
+                for name in ("ean", "sku", "mpn", "product_id", "variant_id", "url")
+            }
+            key = (row.get("key") or "").strip() or values["sku"] or str(i)
+            yield Product(key, **values)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "products",
+        help="csv with columns among key, ean, sku, mpn, product_id, variant_id, url",
+    )
+    parser.add_argument("--retailer", default="trademax", choices=retailers.names())
+    parser.add_argument(
+        "--no-sitemap",
+        action="store_true",
+        help="do not crawl or use the retailer's sitemap index",
+    )
+    parser.add_argument("--output", default="products_resolved.csv")
+    args = parser.parse_args()
+
+    retailer = retailers.get(args.retailer)
+    sitemap_index = None
+    if not args.no_sitemap and retailer.sitemap_path is not None:
+        sitemap_index = SitemapIndex()
+        sitemap_index.ensure_fresh(retailer)
+
+    planner = LookupPlanner(retailer, sitemap_index)
+    resolutions = asyncio.run(resolve_all(planner, read_products(args.products)))
+
+    with open(args.output, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["key", "url", "source", "requests"])
+        for r in resolutions:
+            writer.writerow([r.product.key, r.url or "", r.source or "", r.requests])
+
+    logger.info("Planner", **planner.stats.as_dict())
+    logger.info("Response cache", **client.cache_stats())
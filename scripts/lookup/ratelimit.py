@@ -0,0 +1,133 @@
+import threading
+import time
+from typing import Optional
+
+import structlog
+
+from lookup.engine import domain_of
+
+logger = structlog.get_logger()
+
+# Requests per second each retailer starts at. The limiter then finds the
+# fastest rate the retailer tolerates on its own.
+RETAILER_START_RATES = {
+    "www.trademax.se": 5.0,
+    "www.bygghemma.se": 5.0,
+    "www.ellos.se": 2.0,
+}
+DEFAULT_START_RATE = 5.0
+MIN_RATE = 0.2
+MAX_RATE = 50.0
+
+# Additive increase per healthy response, multiplicative decrease otherwise
+INCREASE_STEP = 0.2
+THROTTLED_DECREASE_FACTOR = 0.5
+SLOW_DECREASE_FACTOR = 0.9
+
+# Responses slower than this mean the retailer is starting to struggle
+LATENCY_TARGET = 2.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose rate adapts to how the retailer responds (AIMD).
+
+    Healthy responses raise the rate by `INCREASE_STEP`. 429s and 5xx halve it,
+    and slow responses shave it a little. A `Retry-After` pauses the bucket
+    entirely until it has passed.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 2.0,
+        min_rate: float = MIN_RATE,
+        max_rate: float = MAX_RATE,
+        latency_target: float = LATENCY_TARGET,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.latency_target = latency_target
+        self.tokens = 1.0
+
+        self._lock = threading.Lock()
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def observe(
+        self, status_code: int, latency: float, retry_after: Optional[float] = None
+    ):
+        with self._lock:
+            if retry_after:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + retry_after
+                )
+
+            if status_code == 429 or status_code >= 500:
+                self.rate = max(self.min_rate, self.rate * THROTTLED_DECREASE_FACTOR)
+            elif latency > self.latency_target:
+                self.rate = max(self.min_rate, self.rate * SLOW_DECREASE_FACTOR)
+            else:
+                self.rate = min(self.max_rate, self.rate + INCREASE_STEP)
+
+
+class RateLimiter:
+    """One adaptive `TokenBucket` per retailer domain."""
+
+    def __init__(self, start_rates: Optional[dict[str, float]] = None):
+        self.start_rates = RETAILER_START_RATES if start_rates is None else start_rates
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        domain = domain_of(url)
+        with self._lock:
+            if domain not in self._buckets:
+                rate = self.start_rates.get(domain, DEFAULT_START_RATE)
+                self._buckets[domain] = TokenBucket(rate)
+            return self._buckets[domain]
+
+    def acquire(self, url: str):
+        self.bucket(url).acquire()
+
+    def observe(
+        self,
+        url: str,
+        status_code: int,
+        latency: float,
+        retry_after: Optional[float] = None,
+    ):
+        bucket = self.bucket(url)
+        rate = bucket.rate
+        bucket.observe(status_code, latency, retry_after)
+        if bucket.rate < rate:
+            logger.info(
+                "Slowing down",
+                domain=domain_of(url),
+                status_code=status_code,
+                latency=round(latency, 2),
+                retry_after=retry_after,
+                rate=round(bucket.rate, 2),
+            )
+
+    def rates(self) -> dict[str, float]:
+        return {domain: round(b.rate, 2) for domain, b in self._buckets.items()}
@@ -0,0 +1,204 @@
+"""Record live responses into a compressed corpus, to replay them offline later.
+
+Set `LOOKUP_RECORD=1` (or to a directory) and every response the shared
+client receives from the network is stored: url, status, final url, headers
+and body. Bodies are stored once per distinct content (by sha256) and
+compressed with zstd. Once enough pages are recorded, a zstd dictionary is
+trained on them, so that thousands of near-identical search pages cost little
+more than what differs between them.
+
+    corpus/
+        manifest.jsonl       one line per recorded response
+        blobs/ab/abcd....zst bodies, by the sha256 of their content
+        dicts/<id>.zdict     the trained compression dictionary
+
+`Corpus.routes()` turns a corpus into `ReplayServer` routes. Recording
+and replaying need the `zstandard` package (`pip install zstandard`).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from lookup.replay_server import ReplayResponse, redirect
+
+DEFAULT_CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "..", "fixtures", "corpus"
+)
+
+COMPRESSION_LEVEL = 12
+
+# Bodies recorded before a dictionary is trained on them, and its size
+TRAIN_AFTER = 64
+DICT_SIZE = 112 * 1024
+
+# Headers that describe the transfer rather than the page; not replayed
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "content-encoding",
+    "content-length",
+    "keep-alive",
+    "transfer-encoding",
+}
+
+
+class Corpus:
+    """A content-addressed, zstd-compressed store of recorded responses."""
+
+    def __init__(self, path: str = DEFAULT_CORPUS_PATH, train_after: int = TRAIN_AFTER):
+        import zstandard
+
+        self._zstd = zstandard
+        self.path = path
+        self.train_after = train_after
+        os.makedirs(os.path.join(path, "blobs"), exist_ok=True)
+        os.makedirs(os.path.join(path, "dicts"), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._samples: list[bytes] = []
+        self._dicts: dict = {}
+        self._dict = self._load_dicts()
+
+    def _load_dicts(self):
+        latest = None
+        for name in sorted(os.listdir(os.path.join(self.path, "dicts"))):
+            with open(os.path.join(self.path, "dicts", name), "rb") as f:
+                latest = self._zstd.ZstdCompressionDict(f.read())
+            self._dicts[latest.dict_id()] = latest
+        return latest
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.path, "blobs", digest[:2], digest + ".zst")
+
+    def put_blob(self, body: bytes) -> str:
+        """Store a body once, returning its sha256."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            return digest
+
+        with self._lock:
+            dictionary = self._dict
+            if dictionary is None and body:
+                self._samples.append(body)
+                if len(self._samples) >= self.train_after:
+                    dictionary = self._train()
+
+        if dictionary is not None:
+            compressor = self._zstd.ZstdCompressor(
+                level=COMPRESSION_LEVEL, dict_data=dictionary
+            )
+        else:
+            compressor = self._zstd.ZstdCompressor(level=COMPRESSION_LEVEL)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressor.compress(body))
+        os.replace(tmp_path, path)
+        return digest
+
+    def _train(self):
+        """Train the dictionary on the samples so far. Called with the lock held."""
+        try:
+            dictionary = self._zstd.train_dictionary(DICT_SIZE, self._samples)
+        except self._zstd.ZstdError:
+            # Too few or too small samples; keep compressing without a dictionary
+            self._samples.clear()
+            return None
+        with open(
+            os.path.join(self.path, "dicts", f"{dictionary.dict_id()}.zdict"), "wb"
+        ) as f:
+            f.write(dictionary.as_bytes())
+        self._dicts[dictionary.dict_id()] = dictionary
+        self._dict = dictionary
+        self._samples.clear()
+        return dictionary
+
+    def get_blob(self, digest: str) -> bytes:
+        with open(self._blob_path(digest), "rb") as f:
+            data = f.read()
+        dict_id = self._zstd.get_frame_parameters(data).dict_id
+        if dict_id:
+            decompressor = self._zstd.ZstdDecompressor(dict_data=self._dicts[dict_id])
+        else:
+            decompressor = self._zstd.ZstdDecompressor()
+        return decompressor.decompress(data)
+
+    def record(self, method: str, url: str, response: requests.Response):
+        body = response.content if method != "HEAD" else b""
+        entry = {
+            "recorded_at": time.time(),
+            "method": method,
+            "url": url,
+            "status": response.status_code,
+            "final_url": response.url,
+            "headers": dict(response.headers),
+            "body": self.put_blob(body),
+            "size": len(body),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(os.path.join(self.path, "manifest.jsonl"), "a") as f:
+                f.write(line)
+
+    def entries(self) -> Iterator[dict]:
+        """Every recorded response, oldest first."""
+        manifest = os.path.join(self.path, "manifest.jsonl")
+        if not os.path.exists(manifest):
+            return
+        with open(manifest) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def routes(self, host: Optional[str] = None) -> dict[str, ReplayResponse]:
+        """`ReplayServer` routes for the recorded GET responses, the latest of each url.
+
+        Requests that were redirected replay as a redirect to the final path.
+        Pass `host` to keep only the responses of one retailer.
+        """
+        routes: dict[str, ReplayResponse] = {}
+        for entry in self.entries():
+            url = urlsplit(entry["url"])
+            if entry["method"] != "GET" or (host and url.netloc != host):
+                continue
+            final = urlsplit(entry["final_url"])
+            headers = {
+                name: value
+                for name, value in entry["headers"].items()
+                if name.lower() not in HOP_BY_HOP_HEADERS
+            }
+            response = ReplayResponse(
+                self.get_blob(entry["body"]), entry["status"], headers
+            )
+            final_path = _path(final)
+            routes[final_path] = response
+            if _path(url) != final_path:
+                routes[_path(url)] = redirect(final_path)
+        return routes
+
+    def stats(self) -> dict:
+        entries = list(self.entries())
+        blobs = {entry["body"]: entry["size"] for entry in entries}
+        stored = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(self.path)
+            for name in names
+        )
+        return {
+            "responses": len(entries),
+            "bodies": len(blobs),
+            "body_bytes": sum(entry["size"] for entry in entries),
+            "stored_bytes": stored,
+        }
+
+
+def _path(url) -> str:
+    return url.path + (f"?{url.query}" if url.query else "")
@@ -0,0 +1,165 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+@dataclass
+class ReplayResponse:
+    body: bytes
+    status: int = 200
+    headers: dict[str, str] = field(
+        default_factory=lambda: {"Content-Type": "text/html; charset=utf-8"}
+    )
+
+
+def redirect(location: str, status: int = 301) -> ReplayResponse:
+    """A response that redirects to `location`, a path or a full url."""
+    return ReplayResponse(b"", status=status, headers={"Location": location})
+
+
+class _CountingWriter:
+    """A socket file that counts the bytes written to it."""
+
+    def __init__(self, file):
+        self._file = file
+        self.written = 0
+
+    def write(self, data: bytes) -> int:
+        n = self._file.write(data)
+        self.written += len(data)
+        return n
+
+    def __getattr__(self, name: str):
+        return getattr(self._file, name)
+
+
+class ReplayServer:
+    """Local stand-in for a retailer that replays recorded pages.
+
+    `routes` maps a request path including its query string (for example
+    `/search?q=1475295`) to the response to replay. Requests for unknown paths
+    get `default`, or a 404 when there is none. Every response is delayed by
+    `latency` seconds plus a random 0 to `jitter` seconds to approximate a
+    real round trip, and a random `error_rate` share of requests is answered
+    with `error_status` instead. Pass a `seed` to make those draws repeatable.
+
+    `request_count` and `bytes_sent` count what was served since the start or
+    the last `reset_stats`. `bytes_sent` is every byte written, status lines
+    and headers included, and so also bodies the client stopped reading:
+    the socket buffers take them anyway.
+
+        with ReplayServer(routes, default=not_found_page, latency=0.1) as server:
+            requests.get(server.base_url + "/search?q=1475295")
+    """
+
+    def __init__(
+        self,
+        routes: Optional[dict[str, ReplayResponse]] = None,
+        default: Optional[ReplayResponse] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.routes = routes or {}
+        self.default = default
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.request_count = 0
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                self.wfile = _CountingWriter(self.wfile)
+
+            def handle(self):
+                try:
+                    super().handle()
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client stopped reading early, which lookups do on purpose
+                    pass
+
+            def do_GET(self):
+                self._reply(send_body=True)
+
+            def do_HEAD(self):
+                self._reply(send_body=False)
+
+            def _reply(self, send_body: bool):
+                response = server.respond(self.path)
+                written = self.wfile.written
+                try:
+                    self.send_response(response.status)
+                    for name, value in response.headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(response.body)))
+                    self.end_headers()
+                    if send_body:
+                        self.wfile.write(response.body)
+                finally:
+                    with server._lock:
+                        server.bytes_sent += self.wfile.written - written
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def respond(self, path: str) -> ReplayResponse:
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+
+        if failed:
+            return ReplayResponse(b"Service unavailable", status=self.error_status)
+        response = self.routes.get(path, self.default)
+        if response is None:
+            return ReplayResponse(b"Not found", status=404)
+        return response
+
+    def reset_stats(self):
+        with self._lock:
+            self.request_count = 0
+            self.bytes_sent = 0
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
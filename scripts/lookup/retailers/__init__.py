@@ -0,0 +1,127 @@
+"""Retailer adapters: everything that differs between retailers, in one place.
+
+Each retailer lives in its own module in this package and defines a
+`RETAILER = Retailer(...)` with its base url, search page and precompiled
+product url pattern. Modules are imported by `get` the first time that
+retailer is asked for, so a script only pays for the retailers it uses.
+
+To add a retailer, add a module here and list it in `_ADAPTERS`.
+"""
+
+import importlib
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from lookup import client
+from lookup.breaker import RequestError
+from lookup.budget import Mode
+from lookup.engine import domain_of
+from lookup.existence import ExistenceCheck, check_exists
+from lookup.scanner import SearchPageScanner
+
+_ADAPTERS = {
+    "bygghemma": "lookup.retailers.bygghemma",
+    "ellos": "lookup.retailers.ellos",
+    "trademax": "lookup.retailers.trademax",
+    "venture_design": "lookup.retailers.venture_design",
+}
+
+_loaded: dict[str, "Retailer"] = {}
+
+
+@dataclass(frozen=True)
+class Retailer:
+    name: str
+    base_url: str
+    # Search page for a query, relative to `base_url`, e.g. "/search?q={query}"
+    search_path: Optional[str] = None
+    # Tells product pages apart from search, category and error pages
+    product_url_pattern: Optional[re.Pattern] = None
+    # Whether the search page embeds `sku_id` and `"uri"` data `search_by_sku` can scan
+    searchable: bool = False
+    # Sitemap (or sitemap index) listing every product url, relative to `base_url`
+    sitemap_path: Optional[str] = None
+    # Finds the retailer's own ids in a product url, as "product" and "variant" groups
+    product_id_pattern: Optional[re.Pattern] = None
+    # Whether a product url with its variant id cut off is a live page. Only set
+    # this once checked against the live site, see `variants.check_group`
+    serves_parent_url: bool = False
+
+    @property
+    def domain(self) -> str:
+        return domain_of(self.base_url)
+
+    @property
+    def sitemap_url(self) -> str:
+        if self.sitemap_path is None:
+            raise ValueError(f"No sitemap known for {self.name}")
+        return self.base_url + self.sitemap_path
+
+    def product_ids(self, url: str) -> Optional[tuple[str, Optional[str]]]:
+        """The (product id, variant id) in a product url, or None for other urls."""
+        if self.product_id_pattern is None:
+            return None
+        match = self.product_id_pattern.search(url)
+        if match is None:
+            return None
+        return match.group("product"), match.group("variant")
+
+    def search_url(self, query: str) -> str:
+        if self.search_path is None:
+            raise ValueError(f"No search page known for {self.name}")
+        return self.base_url + self.search_path.format(query=query)
+
+    def search_by_sku(self, sku: str) -> Optional[str]:
+        """Search the retailer for a SKU and return the url of the 1st product found.
+
+        If the search redirects straight to a product page, that page is the
+        result. Otherwise the search page is read only until the SKU and the
+        1st product uri show up in it.
+        """
+        return self.search(sku, scan=True)
+
+    def search(self, query: str, scan: bool = False) -> Optional[str]:
+        """Search the retailer and return a product url only when the hit is certain.
+
+        A search that redirects straight to a product page is always a hit.
+        With `scan`, `query` is a SKU and the search page is also scanned for
+        it, see `search_by_sku`. Without it, a page of search results is not a
+        hit: nothing on it says which product, if any, has that EAN or MPN.
+        """
+        if not self.searchable:
+            raise ValueError(f"No search known for {self.name}")
+
+        # A scan reads the page, so it needs the full budget before it is sent
+        mode = Mode.FULL if scan else Mode.HEADERS_ONLY
+        with client.stream(self.search_url(query), mode=mode) as response:
+            if response.status_code >= 300:
+                raise RequestError(response.status_code)
+
+            # Check to see if we got redirected to a product page:
+            if self.product_url_pattern.search(response.url):
+                return response.url
+            if not scan:
+                return None
+
+            scanner = SearchPageScanner(query)
+            client.read_until(response, scanner.feed)
+
+        return scanner.product_url(self.base_url)
+
+    def check_product(self, url: str) -> ExistenceCheck:
+        """Check whether a product url on this retailer is still live."""
+        return check_exists(url, self.product_url_pattern)
+
+
+def get(name: str) -> Retailer:
+    """The adapter for `name`, importing its module on first use."""
+    if name not in _loaded:
+        if name not in _ADAPTERS:
+            raise KeyError(f"Unknown retailer: {name}")
+        _loaded[name] = importlib.import_module(_ADAPTERS[name]).RETAILER
+    return _loaded[name]
+
+
+def names() -> list[str]:
+    return sorted(_ADAPTERS)
@@ -0,0 +1,17 @@
+import os
+import re
+
+from lookup.retailers import Retailer
+
+RETAILER = Retailer(
+    name="bygghemma",
+    # Overridable so that benchmarks can point the search at a local replay server
+    base_url=os.getenv("BYGGHEMMA_BASE_URL", "https://www.bygghemma.se"),
+    search_path="/sok/?phrase={query}",
+    product_url_pattern=re.compile(r"/p-\d+"),
+    searchable=True,
+    sitemap_path="/sitemap.xml",
+    product_id_pattern=re.compile(
+        r"/p-(?P<product>\d+)(?:-(?P<variant>\d+))?(?=[/?#]|$)"
+    ),
+)
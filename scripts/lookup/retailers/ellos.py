@@ -0,0 +1,14 @@
+import os
+import re
+
+from lookup.retailers import Retailer
+
+RETAILER = Retailer(
+    name="ellos",
+    base_url=os.getenv("ELLOS_BASE_URL", "https://www.ellos.se"),
+    # Product pages end in the article number and variant, e.g. /1748457-01-0
+    product_url_pattern=re.compile(r"/\d{7}-\d{2}"),
+    product_id_pattern=re.compile(
+        r"/(?P<product>\d{7})-(?P<variant>\d{2}(?:-\d+)?)(?=[/?#]|$)"
+    ),
+)
@@ -0,0 +1,10 @@
+import os
+
+from lookup.retailers import Retailer
+
+# Only the search page is known, it is opened by hand: see search_manual.py
+RETAILER = Retailer(
+    name="venture_design",
+    base_url=os.getenv("VENTURE_DESIGN_BASE_URL", "https://www.venturedesign.se"),
+    search_path="/search/{query}",
+)
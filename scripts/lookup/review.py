@@ -0,0 +1,238 @@
+"""Pre-fetch search pages and lay out their top hits in one static HTML report.
+
+Reviewing search results by hand used to mean opening a browser tab per
+query. `review` fetches all the search pages at once through the engine,
+pulls the top candidates (title, image, url) out of each page and writes a
+single HTML file to scroll through, with a link to each live search page.
+"""
+
+import html
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, Optional
+from urllib.parse import unquote, urljoin
+
+import structlog
+
+from lookup import client
+from lookup.engine import LookupEngine, run_lookups
+from lookup.retailers import Retailer
+from lookup.scanner import URI_PATTERN
+
+logger = structlog.get_logger()
+
+# Candidates shown per query
+TOP_CANDIDATES = 5
+
+
+@dataclass
+class Candidate:
+    title: str
+    url: str
+    image: Optional[str] = None
+
+
+@dataclass
+class ReviewRow:
+    query: str
+    search_url: str
+    candidates: list[Candidate] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class _JsonLdParser(HTMLParser):
+    """Collects the contents of `<script type="application/ld+json">` tags."""
+
+    def __init__(self):
+        super().__init__()
+        self.blocks: list[str] = []
+        self._in_json_ld = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script" and dict(attrs).get("type") == "application/ld+json":
+            self._in_json_ld = True
+            self.blocks.append("")
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            self._in_json_ld = False
+
+    def handle_data(self, data):
+        if self._in_json_ld:
+            self.blocks[-1] += data
+
+
+def _json_ld_objects(page: str) -> Iterator[dict]:
+    parser = _JsonLdParser()
+    parser.feed(page)
+    for block in parser.blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(reversed(node))
+            elif isinstance(node, dict):
+                yield node
+                stack.extend(reversed(node.get("@graph", [])))
+
+
+def _first_image(image, base_url: str) -> Optional[str]:
+    if isinstance(image, list):
+        image = image[0] if image else None
+    if isinstance(image, dict):
+        image = image.get("url")
+    # The report is opened from disk, so relative image urls would not load
+    return urljoin(base_url, image) if isinstance(image, str) else None
+
+
+def _from_json_ld(page: str, base_url: str) -> Iterator[Candidate]:
+    for node in _json_ld_objects(page):
+        if node.get("@type") == "ItemList":
+            for element in node.get("itemListElement", []):
+                item = element.get("item", element)
+                if isinstance(item, str):
+                    item = {"url": item, "name": element.get("name")}
+                if isinstance(item, dict) and item.get("url"):
+                    yield Candidate(
+                        item.get("name") or _title_from_url(item["url"]),
+                        urljoin(base_url, item["url"]),
+                        _first_image(item.get("image"), base_url),
+                    )
+        elif node.get("@type") == "Product" and node.get("url"):
+            yield Candidate(
+                node.get("name") or _title_from_url(node["url"]),
+                urljoin(base_url, node["url"]),
+                _first_image(node.get("image"), base_url),
+            )
+
+
+def _from_uris(page: str, base_url: str) -> Iterator[Candidate]:
+    """The `"uri":"\\/..."` entries the SKU search relies on, when there is no JSON-LD."""
+    for match in URI_PATTERN.finditer(page.encode()):
+        url = base_url + match.group(1).decode().replace("\\/", "/")
+        yield Candidate(_title_from_url(url), url)
+
+
+def _title_from_url(url: str) -> str:
+    slug = unquote(url.rstrip("/").rsplit("/", 1)[-1])
+    return re.sub(r"[-_]+", " ", slug).strip()
+
+
+def extract_candidates(
+    page: str, base_url: str, limit: int = TOP_CANDIDATES
+) -> list[Candidate]:
+    """The first `limit` distinct products on a search page, in page order."""
+    candidates: list[Candidate] = []
+    seen: set[str] = set()
+    for source in (_from_json_ld, _from_uris):
+        for candidate in source(page, base_url):
+            if candidate.url not in seen:
+                seen.add(candidate.url)
+                candidates.append(candidate)
+            if len(candidates) >= limit:
+                return candidates
+    return candidates
+
+
+def fetch_review_row(retailer: Retailer, query: str) -> ReviewRow:
+    search_url = retailer.search_url(query)
+    row = ReviewRow(query, search_url)
+    try:
+        response = client.get(search_url)
+    except Exception as e:
+        row.error = str(e)
+        return row
+
+    if response.status_code >= 300:
+        row.error = f"status_code: {response.status_code}"
+    elif retailer.product_url_pattern and retailer.product_url_pattern.search(
+        response.url
+    ):
+        # The search went straight to a product page: that page is the only hit
+        found = Candidate(_title_from_url(response.url), response.url)
+        for candidate in _from_json_ld(response.text, retailer.base_url):
+            if candidate.url == response.url:
+                found = candidate
+                break
+        row.candidates = [found]
+    else:
+        row.candidates = extract_candidates(response.text, retailer.base_url)
+    return row
+
+
+def review(
+    retailer: Retailer,
+    queries: Iterable[str],
+    engine: Optional[LookupEngine] = None,
+) -> list[ReviewRow]:
+    """Fetch the search page of every query concurrently, keeping the input order."""
+    queries = list(queries)
+    rows = run_lookups(
+        queries,
+        lambda query: fetch_review_row(retailer, query),
+        domain=lambda _: retailer.domain,
+        engine=engine,
+    )
+    return [rows[query] for query in queries]
+
+
+REPORT_STYLE = """
+body { font-family: sans-serif; margin: 2em; color: #222; }
+section { border-top: 1px solid #ccc; padding: 1em 0; }
+h2 { font-size: 1.1em; margin: 0 0 .5em; }
+.candidates { display: flex; gap: 1em; flex-wrap: wrap; }
+.candidate { width: 180px; font-size: .85em; }
+.candidate img { width: 180px; height: 180px; object-fit: contain; background: #f4f4f4; }
+.none, .error { color: #a33; }
+"""
+
+
+def render_report(rows: list[ReviewRow], title: str) -> str:
+    esc = html.escape
+    parts = [
+        "<!DOCTYPE html>",
+        '<html><head><meta charset="utf-8">',
+        f"<title>{esc(title)}</title><style>{REPORT_STYLE}</style></head><body>",
+        f"<h1>{esc(title)}</h1>",
+        f"<p>{len(rows)} queries, {sum(bool(r.candidates) for r in rows)} with"
+        f" results. Generated {datetime.now():%Y-%m-%d %H:%M}.</p>",
+    ]
+    for row in rows:
+        parts.append("<section>")
+        parts.append(
+            f'<h2>{esc(row.query)} <a href="{esc(row.search_url)}"'
+            ' target="_blank">search page</a></h2>'
+        )
+        if row.error:
+            parts.append(f'<p class="error">Error: {esc(row.error)}</p>')
+        elif not row.candidates:
+            parts.append('<p class="none">No results</p>')
+        else:
+            parts.append('<div class="candidates">')
+            for candidate in row.candidates:
+                image = (
+                    f'<img loading="lazy" src="{esc(candidate.image)}" alt="">'
+                    if candidate.image
+                    else ""
+                )
+                parts.append(
+                    f'<a class="candidate" href="{esc(candidate.url)}"'
+                    f' target="_blank">{image}<div>{esc(candidate.title)}</div></a>'
+                )
+            parts.append("</div>")
+        parts.append("</section>")
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def write_report(path: str, rows: list[ReviewRow], title: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_report(rows, title))
+    logger.info("Review report written", path=path, queries=len(rows))
@@ -0,0 +1,64 @@
+import re
+from typing import Optional
+
+URI_PREFIX = b'"uri":"'
+URI_PATTERN = re.compile(rb'"uri":"(\\\/[^"]+)"')
+
+# Longest partial `"uri":"...` kept across a chunk boundary
+MAX_URI_LENGTH = 4096
+
+
+class SearchPageScanner:
+    """Finds the search hit for a SKU in a search page, one chunk of bytes at a time.
+
+    Does in a single pass what the scripts did with two full scans of
+    `response.text`: look for the `sku_id":"<sku>` marker, and take the first
+    `"uri":"\\/..."` on the page as the product. Both patterns are matched
+    across chunk boundaries. `feed` returns True as soon as both have been
+    seen, so the caller can stop downloading the rest of the page.
+    """
+
+    def __init__(self, sku: str):
+        self.marker = f'sku_id":"{sku}'.encode()
+        self.marker_found = False
+        self.uri: Optional[bytes] = None
+        self._marker_tail = b""
+        self._uri_tail = b""
+
+    @property
+    def done(self) -> bool:
+        return self.marker_found and self.uri is not None
+
+    def feed(self, chunk: bytes) -> bool:
+        if not self.marker_found:
+            buffer = self._marker_tail + chunk
+            if self.marker in buffer:
+                self.marker_found = True
+            self._marker_tail = buffer[-(len(self.marker) - 1) :]
+
+        if self.uri is None:
+            buffer = self._uri_tail + chunk
+            match = URI_PATTERN.search(buffer)
+            if match:
+                self.uri = match.group(1)
+            self._uri_tail = _open_uri_tail(buffer)
+
+        return self.done
+
+    def product_url(self, base_url: str) -> Optional[str]:
+        """The product url of the search hit, or None if the SKU is not in the results."""
+        if not self.done:
+            return None
+        return base_url + self.uri.decode().replace("\\/", "/")
+
+
+def _open_uri_tail(buffer: bytes) -> bytes:
+    """The end of `buffer` that could still be the start of a `"uri":"..."` match."""
+    start = buffer.rfind(URI_PREFIX)
+    if (
+        start != -1
+        and len(buffer) - start <= MAX_URI_LENGTH
+        and b'"' not in buffer[start + len(URI_PREFIX) :]
+    ):
+        return buffer[start:]
+    return buffer[-(len(URI_PREFIX) - 1) :]
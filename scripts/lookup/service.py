@@ -0,0 +1,107 @@
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import time
+from typing import Optional
+
+import requests
+
+REPO_ROOT = os.path.realpath(
+    os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")
+)
+
+READY_TIMEOUT = 120
+READY_POLL_INTERVAL = 0.25
+STOP_TIMEOUT = 10
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ServiceProcess:
+    """Runs the scraper service (`npm run dev`) on a free port for as long as needed.
+
+    `start` returns as soon as the service answers its `GET /` health route,
+    rather than after a fixed sleep. The service runs in its own process group,
+    so `stop` also takes down the node process that npm spawns, without
+    touching whatever else might be listening on port 8080.
+
+        with ServiceProcess() as service:
+            requests.post(service.base_url + "/scrapeDetails", ...)
+    """
+
+    def __init__(
+        self,
+        command: tuple[str, ...] = ("npm", "run", "dev"),
+        cwd: str = REPO_ROOT,
+        port: Optional[int] = None,
+        clean_storage: bool = True,
+        ready_timeout: float = READY_TIMEOUT,
+    ):
+        self.command = command
+        self.cwd = cwd
+        self.port = port
+        self.clean_storage = clean_storage
+        self.ready_timeout = ready_timeout
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://localhost:{self.port}"
+
+    def start(self) -> "ServiceProcess":
+        if self.clean_storage:
+            # Make sure we don't persist the cookies between sessions
+            shutil.rmtree(os.path.join(self.cwd, "storage"), ignore_errors=True)
+
+        self.port = self.port or free_port()
+        self.process = subprocess.Popen(
+            self.command,
+            cwd=self.cwd,
+            env={**os.environ, "PORT": str(self.port)},
+            start_new_session=True,
+        )
+        try:
+            self.wait_until_ready()
+        except Exception:
+            self.stop()
+            raise
+        return self
+
+    def wait_until_ready(self):
+        deadline = time.monotonic() + self.ready_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(
+                    f"Service exited during startup with code {self.process.returncode}"
+                )
+            try:
+                if requests.get(self.base_url + "/", timeout=1).ok:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(READY_POLL_INTERVAL)
+
+        raise TimeoutError(f"Service not ready after {self.ready_timeout}s")
+
+    def stop(self):
+        if self.process is None or self.process.poll() is not None:
+            return
+
+        os.killpg(self.process.pid, signal.SIGTERM)
+        try:
+            self.process.wait(STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+
+    def __enter__(self) -> "ServiceProcess":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,266 @@
+"""Index a retailer's product urls from its sitemap, by the ids in the urls.
+
+    python -m lookup.sitemap trademax [bygghemma ...]
+
+Crawling the sitemap once costs a handful of requests, after which every
+product id (and variant id) the retailer lists resolves to its url with a
+local lookup instead of a search request.
+
+The ids are the retailer's own, taken from the url: `-p1730164-v1375662` on
+trademax, `/p-1769957-1769958` on bygghemma. They are not the supplier SKUs
+that the search pages match on.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zlib
+from typing import Iterable, Iterator, Optional
+
+import structlog
+
+from lookup import client, retailers
+from lookup.breaker import RequestError
+from lookup.budget import Mode
+
+logger = structlog.get_logger()
+
+DEFAULT_SITEMAP_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "..", ".cache", "sitemap_index.sqlite"
+)
+
+DAY = 24 * 60 * 60
+
+# Crawl the sitemap again when the index of a retailer is older than this
+MAX_AGE = 7 * DAY
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Sitemaps nested deeper than this are not followed
+MAX_DEPTH = 3
+
+BATCH_SIZE = 1000
+
+
+def iter_sitemap(url: str, depth: int = 0) -> Iterator[str]:
+    """Yield every page url in a sitemap, following sitemap indexes.
+
+    The sitemap is streamed and parsed as it arrives, gunzipping it on the
+    fly when it is a `.xml.gz`, so memory use does not grow with its size.
+    Sitemaps are not kept in the response cache, they are read once per crawl.
+    """
+    child_sitemaps = []
+    parser = ET.XMLPullParser(events=("start", "end"))
+    container = None
+
+    with client.stream(url, use_cache=False, mode=Mode.FULL) as response:
+        if response.status_code >= 300:
+            raise RequestError(response.status_code)
+
+        decompressor = None
+        for chunk in response.iter_content(client.STREAM_CHUNK_SIZE):
+            if decompressor is None:
+                # A .xml.gz is usually served as is, without Content-Encoding
+                if chunk.startswith(GZIP_MAGIC):
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                else:
+                    decompressor = _Passthrough()
+            parser.feed(decompressor.decompress(chunk))
+
+            for event, element in parser.read_events():
+                tag = _local_name(element.tag)
+                if event == "start":
+                    if tag in ("url", "sitemap"):
+                        container = tag
+                    continue
+                if tag == "loc" and element.text:
+                    loc = element.text.strip()
+                    if container == "sitemap":
+                        child_sitemaps.append(loc)
+                    else:
+                        yield loc
+                elif tag in ("url", "sitemap"):
+                    # Drop parsed entries, only the current one is needed
+                    element.clear()
+
+        parser.close()
+
+    for child in child_sitemaps:
+        if depth >= MAX_DEPTH:
+            logger.warning("Sitemap nested too deep, skipped", url=child)
+            continue
+        yield from iter_sitemap(child, depth + 1)
+
+
+class _Passthrough:
+    def decompress(self, chunk: bytes) -> bytes:
+        return chunk
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+class SitemapIndex:
+    """Product urls per retailer, keyed by the product and variant ids in them.
+
+    Product ids and variant ids are numbered separately (trademax's `p1375662`
+    and `v1375662` are unrelated), so they are looked up separately too. When
+    several variants of a product are listed, looking up the product id
+    returns the one without a variant if listed, else any of them.
+    """
+
+    def __init__(self, path: str = DEFAULT_SITEMAP_INDEX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS products (
+                retailer TEXT NOT NULL,
+                product_id TEXT NOT NULL,
+                variant_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                PRIMARY KEY (retailer, product_id, variant_id)
+            )
+            """)
+        self._db.execute("""
+            CREATE INDEX IF NOT EXISTS products_variant
+            ON products (retailer, variant_id)
+            """)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS crawls (
+                retailer TEXT PRIMARY KEY,
+                crawled_at REAL NOT NULL,
+                urls INTEGER NOT NULL
+            )
+            """)
+        self._db.commit()
+
+    def build(self, retailer: retailers.Retailer, urls: Iterable[str]) -> int:
+        """Replace the index of `retailer` with the product urls in `urls`."""
+        n_products = 0
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM products WHERE retailer = ?", (retailer.name,)
+            )
+            batch = []
+            for url in urls:
+                ids = retailer.product_ids(url)
+                if ids is None:
+                    continue
+                product_id, variant_id = ids
+                batch.append((retailer.name, product_id, variant_id or "", url))
+                if len(batch) >= BATCH_SIZE:
+                    n_products += self._insert(batch)
+                    batch = []
+            n_products += self._insert(batch)
+            self._db.execute(
+                "INSERT OR REPLACE INTO crawls VALUES (?, ?, ?)",
+                (retailer.name, time.time(), n_products),
+            )
+            self._db.commit()
+        return n_products
+
+    def _insert(self, batch: list[tuple]) -> int:
+        self._db.executemany(
+            "INSERT OR IGNORE INTO products VALUES (?, ?, ?, ?)", batch
+        )
+        return len(batch)
+
+    def crawl(self, retailer: retailers.Retailer) -> int:
+        """Crawl the sitemap of `retailer` and index its product urls."""
+        start = time.perf_counter()
+        n_products = self.build(retailer, iter_sitemap(retailer.sitemap_url))
+        logger.info(
+            "Sitemap indexed",
+            retailer=retailer.name,
+            products=n_products,
+            elapsed=round(time.perf_counter() - start, 1),
+        )
+        return n_products
+
+    def age(self, retailer: str) -> Optional[float]:
+        """Seconds since the sitemap of `retailer` was crawled, None if never."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT crawled_at FROM crawls WHERE retailer = ?", (retailer,)
+            ).fetchone()
+        return None if row is None else time.time() - row[0]
+
+    def ensure_fresh(self, retailer: retailers.Retailer, max_age: float = MAX_AGE):
+        age = self.age(retailer.name)
+        if age is None or age > max_age:
+            self.crawl(retailer)
+
+    def get(
+        self,
+        retailer: str,
+        product_id: Optional[str] = None,
+        variant_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """The url listed for a variant id of `retailer`, else for its product id.
+
+        With both ids, the variant must belong to that product, and the product
+        is the fallback when the variant is no longer listed.
+        """
+        with self._lock:
+            row = None
+            if variant_id:
+                row = self._db.execute(
+                    """
+                    SELECT url FROM products
+                    WHERE retailer = ? AND variant_id = ?
+                    AND (? IS NULL OR product_id = ?)
+                    LIMIT 1
+                    """,
+                    (retailer, variant_id, product_id, product_id),
+                ).fetchone()
+            if row is None and product_id:
+                row = self._db.execute(
+                    """
+                    SELECT url FROM products
+                    WHERE retailer = ? AND product_id = ?
+                    ORDER BY variant_id
+                    LIMIT 1
+                    """,
+                    (retailer, product_id),
+                ).fetchone()
+        return None if row is None else row[0]
+
+    def lookup_table(self, retailer: str, kind: str = "product") -> dict[str, str]:
+        """Every "product" or "variant" id of `retailer` mapped to its url.
+
+        To look up many ids in memory, one kind at a time.
+        """
+        if kind not in ("product", "variant"):
+            raise ValueError(f"Unknown id kind: {kind}")
+        table: dict[str, str] = {}
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT product_id, variant_id, url FROM products
+                WHERE retailer = ? ORDER BY product_id, variant_id
+                """,
+                (retailer,),
+            )
+            for product_id, variant_id, url in rows:
+                if kind == "product":
+                    table.setdefault(product_id, url)
+                elif variant_id:
+                    table[variant_id] = url
+        return table
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+if __name__ == "__main__":
+    index = SitemapIndex()
+    for name in sys.argv[1:] or ["trademax"]:
+        index.crawl(retailers.get(name))
+    index.close()
@@ -0,0 +1,43 @@
+import pytest
+
+from lookup.breaker import CircuitBreaker, CircuitOpen, State
+
+
+@pytest.fixture
+def breaker() -> CircuitBreaker:
+    """A breaker that opens on 2 failures and is ready to probe right away."""
+    breaker = CircuitBreaker("example.com", min_requests=2, open_for=0)
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record(False)
+    assert breaker.state == State.OPEN
+    return breaker
+
+
+def test_probe_closes_the_circuit(breaker):
+    probe = breaker.before_request()
+
+    assert probe is not None
+    with pytest.raises(CircuitOpen):
+        breaker.before_request()
+    assert breaker.record(True, probe) == State.CLOSED
+
+
+def test_request_sent_before_the_circuit_opened_is_not_the_probe(breaker):
+    probe = breaker.before_request()
+
+    # A slow request sent while the circuit was still closed comes back
+    assert breaker.record(True) is None
+    assert breaker.state == State.HALF_OPEN
+    assert breaker.record(False, probe) == State.OPEN
+
+
+def test_probe_without_outcome_frees_its_slot(breaker):
+    probe = breaker.before_request()
+    breaker.release(probe)
+
+    next_probe = breaker.before_request()
+    assert next_probe is not None and next_probe is not probe
+    # The first probe coming back late no longer counts
+    assert breaker.record(False, probe) is None
+    assert breaker.record(True, next_probe) == State.CLOSED
@@ -0,0 +1,66 @@
+import asyncio
+import dataclasses
+
+import pytest
+
+from lookup import client, retailers
+from lookup.budget import BandwidthBudget, BudgetExceeded, HeadersOnly, Mode
+from lookup.engine import LookupEngine
+from lookup.replay_server import ReplayResponse, ReplayServer
+
+
+@pytest.fixture(autouse=True)
+def offline_client(monkeypatch):
+    for name in ("LOOKUP_CACHE", "LOOKUP_RATE_LIMIT", "LOOKUP_BREAKER"):
+        monkeypatch.setenv(name, "0")
+    monkeypatch.setenv("LOOKUP_BUDGET", "1")
+
+
+@pytest.fixture
+def server():
+    with ReplayServer(default=ReplayResponse(b"<html><body></body></html>")) as server:
+        yield server
+
+
+def spent_budget(server: ReplayServer, share: float) -> BandwidthBudget:
+    domain = server.base_url.split("://", 1)[1]
+    budget = BandwidthBudget(budgets={domain: 1000})
+    budget.spent[domain] = int(share * 1000)
+    return budget
+
+
+def test_scan_search_is_not_sent_once_only_headers_are_allowed(server, monkeypatch):
+    budget = spent_budget(server, 0.9)
+    monkeypatch.setattr(client, "_budget", budget)
+    trademax = dataclasses.replace(retailers.get("trademax"), base_url=server.base_url)
+
+    assert budget.mode(server.base_url) == Mode.HEADERS_ONLY
+    with pytest.raises(HeadersOnly):
+        trademax.search_by_sku("1234")
+    assert server.request_count == 0
+    # A search that only follows the redirect still goes out
+    assert trademax.search("1234") is None
+    assert server.request_count == 1
+
+
+def test_spent_budget_skips_lookups_without_stopping_the_run(server, monkeypatch):
+    monkeypatch.setattr(client, "_budget", spent_budget(server, 1))
+
+    def lookup(key: int) -> int:
+        if key % 2:
+            # Not cached
+            client.get(f"{server.base_url}/{key}")
+        return key
+
+    async def collect():
+        engine = LookupEngine(max_retries=3)
+        return [
+            result
+            async for result in engine.map(range(6), lookup, domain=lambda _: "replay")
+        ]
+
+    results = sorted(asyncio.run(collect()), key=lambda result: result.key)
+
+    assert [result.value for result in results] == [0, None, 2, None, 4, None]
+    assert all(isinstance(result.error, BudgetExceeded) for result in results[1::2])
+    assert server.request_count == 0
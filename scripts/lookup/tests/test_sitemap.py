@@ -0,0 +1,146 @@
+import dataclasses
+import gzip
+
+import pytest
+
+from lookup import retailers
+from lookup.replay_server import ReplayResponse, ReplayServer
+from lookup.sitemap import SitemapIndex, iter_sitemap
+
+PRODUCT_PATHS = [
+    "/soffa-vicky-p100",
+    "/soffa-vicky-p100-v200",
+    "/soffa-vicky-p100-v201",
+    # Product 200 is unrelated to variant 200 of product 100
+    "/stol-rakel-p200",
+    "/bord-borneo-p300-v301",
+]
+
+
+def urlset(urls: list[str]) -> bytes:
+    locs = "".join(f"<url><loc>{url}</loc></url>" for url in urls)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>'
+    ).encode()
+
+
+def sitemap_index(urls: list[str]) -> bytes:
+    locs = "".join(f"<sitemap><loc>{url}</loc></sitemap>" for url in urls)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"{locs}</sitemapindex>"
+    ).encode()
+
+
+@pytest.fixture(autouse=True)
+def offline_client(monkeypatch):
+    for name in (
+        "LOOKUP_CACHE",
+        "LOOKUP_RATE_LIMIT",
+        "LOOKUP_BREAKER",
+        "LOOKUP_BUDGET",
+    ):
+        monkeypatch.setenv(name, "0")
+
+
+@pytest.fixture
+def server():
+    """A trademax-like sitemap index, with one gzipped and one plain sitemap."""
+    with ReplayServer() as server:
+        base = server.base_url
+        xml = {"Content-Type": "application/xml"}
+        server.routes.update(
+            {
+                "/sitemap.xml": ReplayResponse(
+                    sitemap_index(
+                        [f"{base}/sitemap-products-1.xml.gz", f"{base}/sitemap-2.xml"]
+                    ),
+                    headers=xml,
+                ),
+                "/sitemap-products-1.xml.gz": ReplayResponse(
+                    gzip.compress(urlset([base + p for p in PRODUCT_PATHS[:3]])),
+                    headers={"Content-Type": "application/x-gzip"},
+                ),
+                "/sitemap-2.xml": ReplayResponse(
+                    urlset(
+                        [base + p for p in PRODUCT_PATHS[3:]]
+                        + [f"{base}/mobler/soffor"]
+                    ),
+                    headers=xml,
+                ),
+            }
+        )
+        yield server
+
+
+@pytest.fixture
+def trademax(server) -> retailers.Retailer:
+    return dataclasses.replace(retailers.get("trademax"), base_url=server.base_url)
+
+
+@pytest.fixture
+def index(tmp_path, trademax):
+    index = SitemapIndex(str(tmp_path / "sitemap_index.sqlite"))
+    index.crawl(trademax)
+    yield index
+    index.close()
+
+
+def test_iter_sitemap_follows_the_index_and_gunzips(server, trademax):
+    urls = list(iter_sitemap(trademax.sitemap_url))
+
+    assert urls == [server.base_url + p for p in PRODUCT_PATHS] + [
+        f"{server.base_url}/mobler/soffor"
+    ]
+
+
+def test_crawl_indexes_product_urls_only(tmp_path, trademax):
+    index = SitemapIndex(str(tmp_path / "sitemap_index.sqlite"))
+
+    assert index.crawl(trademax) == len(PRODUCT_PATHS)
+    assert index.age("trademax") < 60
+
+
+def test_product_and_variant_ids_do_not_collide(index, server):
+    base = server.base_url
+
+    assert index.get("trademax", product_id="200") == f"{base}/stol-rakel-p200"
+    assert index.get("trademax", variant_id="200") == f"{base}/soffa-vicky-p100-v200"
+    assert index.get("trademax", variant_id="300") is None
+
+
+def test_product_id_prefers_the_url_without_a_variant(index, server):
+    base = server.base_url
+
+    assert index.get("trademax", product_id="100") == f"{base}/soffa-vicky-p100"
+    assert index.get("trademax", product_id="300") == f"{base}/bord-borneo-p300-v301"
+
+
+def test_variant_of_another_product_falls_back_to_the_product(index, server):
+    base = server.base_url
+
+    assert index.get("trademax", "100", "201") == f"{base}/soffa-vicky-p100-v201"
+    assert index.get("trademax", "300", "200") == f"{base}/bord-borneo-p300-v301"
+    assert index.get("trademax", "999", "200") is None
+
+
+def test_lookup_tables_are_per_id_kind(index, server):
+    base = server.base_url
+
+    products = index.lookup_table("trademax")
+    variants = index.lookup_table("trademax", kind="variant")
+
+    assert products == {
+        "100": f"{base}/soffa-vicky-p100",
+        "200": f"{base}/stol-rakel-p200",
+        "300": f"{base}/bord-borneo-p300-v301",
+    }
+    assert variants == {
+        "200": f"{base}/soffa-vicky-p100-v200",
+        "201": f"{base}/soffa-vicky-p100-v201",
+        "301": f"{base}/bord-borneo-p300-v301",
+    }
+    with pytest.raises(ValueError):
+        index.lookup_table("trademax", kind="sku")
@@ -0,0 +1,80 @@
+import dataclasses
+
+from lookup import retailers
+from lookup.existence import ExistenceCheck, Liveness
+from lookup.variants import canonical_url, check_group, group_by_parent
+
+BASE = "https://www.bygghemma.se/mobler/soffa"
+
+
+class FakeCheck:
+    """Answers from a url -> liveness dict, remembering the urls requested."""
+
+    def __init__(self, liveness: dict[str, Liveness]):
+        self.liveness = liveness
+        self.requested: list[str] = []
+
+    def __call__(self, url: str) -> ExistenceCheck:
+        self.requested.append(url)
+        liveness = self.liveness.get(url, Liveness.NOT_FOUND)
+        status_code = 200 if liveness == Liveness.ALIVE else 404
+        return ExistenceCheck(url, liveness, status_code, url)
+
+
+def test_group_by_parent_keeps_input_order():
+    urls = [f"{BASE}/p-1-2", f"{BASE}/p-3", f"{BASE}/p-1-4", f"{BASE}/p-1-2"]
+
+    groups = group_by_parent(retailers.get("bygghemma"), urls)
+
+    assert groups == {
+        "1": [f"{BASE}/p-1-2", f"{BASE}/p-1-4"],
+        "3": [f"{BASE}/p-3"],
+    }
+
+
+def test_lone_url_is_checked_as_it_is():
+    bygghemma = dataclasses.replace(retailers.get("bygghemma"), serves_parent_url=True)
+    check = FakeCheck({f"{BASE}/p-1-2": Liveness.ALIVE})
+
+    checks = check_group(bygghemma, [f"{BASE}/p-1-2"], check)
+
+    assert check.requested == [f"{BASE}/p-1-2"]
+    assert checks[f"{BASE}/p-1-2"].liveness == Liveness.ALIVE
+
+
+def test_live_variant_vouches_for_its_siblings():
+    urls = [f"{BASE}/p-1-2", f"{BASE}/p-1-4"]
+    check = FakeCheck({urls[0]: Liveness.ALIVE})
+
+    checks = check_group(retailers.get("bygghemma"), urls, check)
+
+    assert check.requested == [urls[0]]
+    assert checks[urls[1]] == ExistenceCheck(urls[1], Liveness.ALIVE, 200, urls[1])
+
+
+def test_gone_variant_does_not_take_its_siblings_with_it():
+    urls = [f"{BASE}/p-1-2", f"{BASE}/p-1-4", f"{BASE}/p-1-5"]
+    check = FakeCheck({urls[2]: Liveness.ALIVE})
+
+    checks = check_group(retailers.get("bygghemma"), urls, check)
+
+    assert check.requested == urls
+    assert [checks[url].liveness for url in urls] == [
+        Liveness.NOT_FOUND,
+        Liveness.NOT_FOUND,
+        Liveness.ALIVE,
+    ]
+
+
+def test_parent_url_is_only_checked_when_served():
+    urls = [f"{BASE}/p-1-2", f"{BASE}/p-1-4"]
+    bygghemma = dataclasses.replace(retailers.get("bygghemma"), serves_parent_url=True)
+    check = FakeCheck({})
+
+    checks = check_group(bygghemma, urls, check)
+
+    assert check.requested == [canonical_url(bygghemma, urls[0])] == [f"{BASE}/p-1"]
+    assert {url: c.liveness for url, c in checks.items()} == {
+        urls[0]: Liveness.NOT_FOUND,
+        urls[1]: Liveness.NOT_FOUND,
+    }
@@ -0,0 +1,115 @@
+from typing import Callable, Iterable, Optional, Sequence
+
+import structlog
+
+from lookup.engine import LookupEngine, run_lookups
+from lookup.existence import ExistenceCheck, Liveness
+from lookup.retailers import Retailer
+
+logger = structlog.get_logger()
+
+
+def parent_id(retailer: Retailer, url: str) -> Optional[str]:
+    """The product id of a variant url, or None when the url has no ids."""
+    ids = retailer.product_ids(url)
+    return None if ids is None else ids[0]
+
+
+def canonical_url(retailer: Retailer, url: str) -> str:
+    """The url of the parent product: `url` with the variant id cut off.
+
+    `/p-1769957-1769958` becomes `/p-1769957` and `-p1730164-v1375662`
+    becomes `-p1730164`. Urls without a variant id are returned as they are.
+    """
+    if retailer.product_id_pattern is None:
+        return url
+    match = retailer.product_id_pattern.search(url)
+    if match is None or match.group("variant") is None:
+        return url
+    return url[: match.end("product")] + url[match.end() :]
+
+
+def group_by_parent(retailer: Retailer, urls: Iterable[str]) -> dict[str, list[str]]:
+    """Group urls by parent product, in input order. Urls without ids stay alone."""
+    groups: dict[str, list[str]] = {}
+    for url in urls:
+        key = parent_id(retailer, url) or url
+        group = groups.setdefault(key, [])
+        if url not in group:
+            group.append(url)
+    return groups
+
+
+def check_group(
+    retailer: Retailer,
+    urls: Sequence[str],
+    check: Optional[Callable[[str], ExistenceCheck]] = None,
+) -> dict[str, ExistenceCheck]:
+    """Check the variant urls of one parent product with as few requests as possible.
+
+    A lone url is checked as it is. Otherwise the parent url (see
+    `canonical_url`) is checked if the retailer serves it, else the 1st
+    variant. While that one is live, the other variants are reported live
+    with their own url: a variant that was dropped while its product stays
+    listed is reported live, which is the price of not requesting it. A gone
+    parent takes its variants with it, but a gone variant says nothing about
+    its siblings, so those are then checked one by one.
+    """
+    check = check or retailer.check_product
+    if len(urls) == 1:
+        return {urls[0]: check(urls[0])}
+
+    if retailer.serves_parent_url:
+        checked = check(canonical_url(retailer, urls[0]))
+        return {url: _for_variant(checked, url) for url in urls}
+
+    checked = check(urls[0])
+    if checked.found_url is not None:
+        return {url: _for_variant(checked, url) for url in urls}
+    return {urls[0]: checked, **{url: check(url) for url in urls[1:]}}
+
+
+def check_by_parent(
+    retailer: Retailer,
+    urls: Iterable[str],
+    check: Optional[Callable[[str], ExistenceCheck]] = None,
+    engine: Optional[LookupEngine] = None,
+) -> dict[str, ExistenceCheck]:
+    """Check every url, grouped by parent product, see `check_group`.
+
+    The groups are checked through the engine. Urls whose group could not be
+    checked, even after retries, are left out of the result.
+    """
+    groups = group_by_parent(retailer, urls)
+    checks = run_lookups(
+        [tuple(variants) for variants in groups.values()],
+        lambda variants: check_group(retailer, variants, check),
+        domain=lambda _: retailer.domain,
+        engine=engine,
+    )
+
+    results: dict[str, ExistenceCheck] = {}
+    failed = 0
+    for variants, checked in checks.items():
+        if checked is None:
+            failed += len(variants)
+            continue
+        results.update(checked)
+
+    logger.info(
+        "Checked by parent product",
+        retailer=retailer.name,
+        urls=len(results),
+        parents=len(groups),
+        failed=failed,
+    )
+    return results
+
+
+def _for_variant(checked: ExistenceCheck, url: str) -> ExistenceCheck:
+    """The outcome for a variant, from the check of its parent or a sibling."""
+    if url == checked.url:
+        return checked
+    if checked.found_url is not None:
+        return ExistenceCheck(url, Liveness.ALIVE, checked.status_code, url)
+    return ExistenceCheck(url, checked.liveness, checked.status_code, checked.final_url)
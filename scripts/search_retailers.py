@@ -0,0 +1,80 @@
+"""Search several retailers for every SKU in a list, in one pass.
+
+    python search_retailers.py missing_skus.csv --retailers trademax bygghemma
+
+Writes a SKU x retailer matrix to `--output`: one row per SKU, one column per
+retailer, holding the product url found there, nothing when there is none, or
+ERROR when the search failed or was skipped for the bandwidth budget.
+"""
+
+import argparse
+import csv
+
+import structlog
+
+from lookup import client, retailers
+from lookup.engine import LookupEngine
+from lookup.fanout import DEFAULT_MAX_IN_FLIGHT, ERROR, run_fan_out_search
+from lookup.inputs import read_identifiers
+
+logger = structlog.get_logger()
+
+# Retailers whose search pages can be scanned for a SKU
+DEFAULT_RETAILERS = ["bygghemma", "trademax"]
+
+
+def write_matrix(path: str, matrix: dict, names: list[str]):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["sku", *names])
+        for sku, found in matrix.items():
+            writer.writerow([sku, *(found.get(name) or "" for name in names)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "skus", help="a .csv/.jsonl/.parquet file of SKUs, or - for stdin"
+    )
+    parser.add_argument("--column", default="sku", help="the column holding SKUs")
+    parser.add_argument(
+        "--retailers",
+        nargs="+",
+        choices=retailers.names(),
+        default=DEFAULT_RETAILERS,
+        help=f"retailers to search, by default {' and '.join(DEFAULT_RETAILERS)}",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=DEFAULT_MAX_IN_FLIGHT,
+        help="searches in flight at once, over all retailers",
+    )
+    parser.add_argument(
+        "--concurrency-per-domain",
+        type=int,
+        default=8,
+        help="searches in flight at once against one retailer",
+    )
+    parser.add_argument("--output", default="retailer_matrix.csv")
+    args = parser.parse_args()
+
+    column = None if args.skus == "-" else args.column
+    engine = LookupEngine(
+        concurrency_per_domain=args.concurrency_per_domain,
+        max_in_flight=args.max_in_flight,
+    )
+    matrix = run_fan_out_search(
+        read_identifiers(args.skus, column=column), args.retailers, engine
+    )
+    write_matrix(args.output, matrix, args.retailers)
+
+    logger.info("Response cache", **client.cache_stats())
+    for retailer in args.retailers:
+        cells = [found.get(retailer) for found in matrix.values()]
+        n_failed = cells.count(ERROR)
+        n_found = len(cells) - cells.count(None) - n_failed
+        print(
+            f"{retailer}: {n_found} out of {len(matrix)} SKUs found,"
+            f" {n_failed} failed or skipped"
+        )
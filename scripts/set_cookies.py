@@ -1,10 +1,15 @@
-import subprocess
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import json
 import time
 import os
+from typing import Optional
 
 import requests
 
+from lookup.service import ServiceProcess
+
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
 # CHANGE THIS if you want to do retailers other than wayfair
@@ -35,30 +40,73 @@ ips = [
 ]
 
 
-def set_cookie_for_an_IP(ip: str):
-    # Clean the storage folder. Just to make sure we don't persist the cookies between
-    # sessions.
-    os.system("rm -r storage/")
+# How many IPs are warmed at the same time by the one running service
+DEFAULT_FAN_OUT = 4
 
-    bashCommand = "npm run dev"
-    with subprocess.Popen(bashCommand.split()) as process:
-        # output, error = process.communicate()
-        # print(output)
+# A /scrapeDetails call opens a real browser, so give it plenty of time
+SCRAPE_TIMEOUT = 300
 
-        time.sleep(10)
 
-        make_requests(ip)
+@dataclass
+class WarmingResult:
+    ip: str
+    success: bool
+    elapsed: float
+    status_code: Optional[int] = None
+    error: Optional[str] = None
 
-        process.terminate()
-        process.kill()
 
-    # The process.kill() doesn't seem to work well, so we do this as well to make sure:
-    os.system("kill -9 $(lsof -t -i:8080)")
+def set_cookie_for_an_IP(ip: str):
+    # Start a fresh service (with a clean storage folder) so that we don't persist
+    # the cookies between sessions.
+    with ServiceProcess() as service:
+        make_requests(ip, service.base_url)
+
     print("Set cookie for IP: " + ip + " successfully")
 
 
-def make_requests(ip: str):
-    url = "http://localhost:8080/scrapeDetails"
+def warm_cookies_concurrently(ips: list[str], fan_out: int = DEFAULT_FAN_OUT):
+    """Warm cookies for all IPs against one long-lived service instance.
+
+    Up to `fan_out` `/scrapeDetails` calls run at the same time instead of
+    restarting the service for every IP.
+    """
+    with ServiceProcess() as service:
+        with ThreadPoolExecutor(max_workers=fan_out) as executor:
+            results = list(executor.map(lambda ip: _warm_ip(ip, service.base_url), ips))
+
+    print_report(results)
+    return results
+
+
+def _warm_ip(ip: str, service_url: str) -> WarmingResult:
+    start = time.perf_counter()
+    try:
+        response = make_requests(ip, service_url)
+    except requests.RequestException as e:
+        return WarmingResult(ip, False, time.perf_counter() - start, error=str(e))
+
+    return WarmingResult(
+        ip,
+        response.status_code < 300,
+        time.perf_counter() - start,
+        status_code=response.status_code,
+    )
+
+
+def print_report(results: list[WarmingResult]):
+    print(f"\n{'IP':<20} {'OK':<4} {'STATUS':<7} {'SECONDS':>8}  ERROR")
+    for r in results:
+        print(
+            f"{r.ip:<20} {'yes' if r.success else 'no':<4} {str(r.status_code or '-'):<7}"
+            f" {r.elapsed:>8.1f}  {r.error or ''}"
+        )
+    n_success = sum(r.success for r in results)
+    print(f"\nWarmed {n_success} out of {len(results)} IPs")
+
+
+def make_requests(ip: str, service_url: str) -> requests.Response:
+    url = service_url + "/scrapeDetails"
     payload = json.dumps(
         {
             "launchOptions": {
@@ -91,10 +139,30 @@ def make_requests(ip: str):
         "Content-Type": "application/json",
     }
 
-    response = requests.request("POST", url, headers=headers, data=payload)
+    response = requests.request(
+        "POST", url, headers=headers, data=payload, timeout=SCRAPE_TIMEOUT
+    )
     print(response.text)
+    return response
 
 
 if __name__ == "__main__":
-    for ip in ips:
-        set_cookie_for_an_IP(ip)
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--fan-out",
+        type=int,
+        default=DEFAULT_FAN_OUT,
+        help="number of IPs to warm at the same time",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="restart the service for every IP, one IP at a time",
+    )
+    args = parser.parse_args()
+
+    if args.sequential:
+        for ip in ips:
+            set_cookie_for_an_IP(ip)
+    else:
+        warm_cookies_concurrently(ips, fan_out=args.fan_out)